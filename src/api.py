@@ -1,170 +1,290 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import asyncio
 import os
 import time
-from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import threading
+from dataclasses import dataclass
+from functools import lru_cache
 
 from src import runtime_config
+from src.env_file import env_config, env_mtime, env_value, load_env_file, queue_env_update
 from src.config.setting import SaxoSettings
-from .executor import list_recent_orders, run_execution_cycle
+from .executor import run_execution_cycle
 from src.auth.saxo_oauth import SaxoOAuthClient, Token
 from .storage import (
     DB_PATH,
-    connect_db,
+    ConnectionPool,
     get_all_trading_events,
     get_event_statistics,
-    get_latest_snapshot,
     get_recent_raw,
-    get_latest_trading_event,
+    get_status_bundle,
+    list_executions,
 )
 from .scheduler import run_scheduler, get_scrape_health
 
 
-app = FastAPI(title="FINCS Ops API", version="0.1.0")
-
-ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
-
-
-
-def _load_env_file() -> None:
-    if not ENV_PATH.exists():
-        return
-    for raw in ENV_PATH.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, val = line.split("=", 1)
-        os.environ[key] = val
-
-
-def _update_env_vars(updates: Dict[str, str]) -> None:
-    existing_lines = []
-    if ENV_PATH.exists():
-        existing_lines = ENV_PATH.read_text(encoding="utf-8").splitlines()
-
-    keys = set(updates.keys())
-    new_lines = []
-    seen = set()
-
-    for line in existing_lines:
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in stripped:
-            new_lines.append(line)
-            continue
-        key, _ = stripped.split("=", 1)
-        if key in updates:
-            new_lines.append(f"{key}={updates[key]}")
-            seen.add(key)
-        else:
-            new_lines.append(line)
-
-    for key in keys - seen:
-        new_lines.append(f"{key}={updates[key]}")
-
-    ENV_PATH.write_text("\n".join(new_lines) + "\n", encoding="utf-8")
-
-    for key, val in updates.items():
-        os.environ[key] = str(val)
+app = FastAPI(title="FINCS Ops API", version="0.1.0", default_response_class=ORJSONResponse)
+
+
+@dataclass(frozen=True)
+class TokenState:
+    """Snapshot of the persisted Saxo token fields, parsed once per check."""
+
+    access: Optional[str]
+    refresh: Optional[str]
+    expires_at: float
+    refresh_expires_at: float
+    checked_at: float
+
+    @property
+    def has_access_token(self) -> bool:
+        return bool(self.access)
+
+    @property
+    def has_refresh_token(self) -> bool:
+        return bool(self.refresh)
+
+    @property
+    def expired(self) -> bool:
+        return bool(self.expires_at) and self.checked_at >= (self.expires_at - 30)
+
+    @property
+    def refresh_expired(self) -> bool:
+        return bool(self.refresh_expires_at) and self.checked_at >= (self.refresh_expires_at - 30)
+
+    @property
+    def refresh_expires_in_seconds(self) -> Optional[int]:
+        if not self.refresh_expires_at:
+            return None
+        return max(0, int(self.refresh_expires_at - self.checked_at))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "has_access_token": self.has_access_token,
+            "has_refresh_token": self.has_refresh_token,
+            "expires_at": int(self.expires_at) if self.expires_at else None,
+            "expired": self.expired,
+            "refresh_expires_at": int(self.refresh_expires_at) if self.refresh_expires_at else None,
+            "refresh_expired": self.refresh_expired,
+            "refresh_expires_in_seconds": self.refresh_expires_in_seconds,
+        }
+
+
+class TokenStore:
+    """
+    In-process home of the Saxo token fields. Readers get typed values without going
+    through os.environ; .env (and os.environ, for other modules) is only touched on persist.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.access = ""
+        self.refresh = ""
+        self.expires_at = 0.0
+        self.refresh_expires_at = 0.0
+        # .env mtime the fields were last loaded from; -1 forces the first load.
+        self.source_mtime = -1
+        # Set by the background refresher when its last attempt failed; reported by /saxo/health.
+        self.last_refresh_error: Optional[str] = None
+
+    def load(self, env: Dict[str, str], mtime: int) -> None:
+        expires_raw = env_value(env, "SAXO_TOKEN_EXPIRES_AT")
+        refresh_expires_raw = env_value(env, "SAXO_REFRESH_TOKEN_EXPIRES_AT")
+        with self._lock:
+            self.access = env_value(env, "SAXO_ACCESS_TOKEN") or ""
+            self.refresh = env_value(env, "SAXO_REFRESH_TOKEN") or ""
+            self.expires_at = float(expires_raw) if expires_raw else 0.0
+            self.refresh_expires_at = float(refresh_expires_raw) if refresh_expires_raw else 0.0
+            self.source_mtime = mtime
+
+    def store(self, token: Token) -> None:
+        with self._lock:
+            self.access = token.access_token
+            if token.refresh_token:
+                self.refresh = token.refresh_token
+            self.expires_at = float(token.expires_at)
+            if token.refresh_expires_at:
+                self.refresh_expires_at = float(token.refresh_expires_at)
+
+    def snapshot(self) -> TokenState:
+        with self._lock:
+            return TokenState(
+                access=self.access or None,
+                refresh=self.refresh or None,
+                expires_at=self.expires_at,
+                refresh_expires_at=self.refresh_expires_at,
+                checked_at=time.time(),
+            )
+
+
+_tokens = TokenStore()
+
+
+def _saxo_token_state() -> TokenState:
+    # Reload only when .env changed on disk: edited outside this process (e.g.
+    # scripts/saxo_auth.py) or a queued write landed, which reloads the same values.
+    env = load_env_file()
+    if env_mtime() != _tokens.source_mtime:
+        _tokens.load(env, env_mtime())
+    return _tokens.snapshot()
 
 
 def _persist_saxo_tokens(token: Token) -> Dict[str, Any]:
+    _tokens.store(token)
     updates = {
         "SAXO_ACCESS_TOKEN": token.access_token,
     }
     if token.refresh_token:
         updates["SAXO_REFRESH_TOKEN"] = token.refresh_token
     updates["SAXO_TOKEN_EXPIRES_AT"] = str(int(token.expires_at))
-    if getattr(token, "refresh_expires_at", None):
+    if token.refresh_expires_at:
         updates["SAXO_REFRESH_TOKEN_EXPIRES_AT"] = str(int(token.refresh_expires_at))
-    _update_env_vars(updates)
-    return {"expires_at": token.expires_at, "refresh_expires_at": getattr(token, "refresh_expires_at", None)}
-
-
-def _refresh_saxo_tokens_if_possible() -> Optional[Dict[str, Any]]:
-    refresh_token = os.getenv("SAXO_REFRESH_TOKEN")
-    if not refresh_token:
+    queue_env_update(updates)
+    _invalidate_token_check()
+    return {"expires_at": token.expires_at, "refresh_expires_at": token.refresh_expires_at}
+
+
+@lru_cache(maxsize=1)
+def _saxo_client_for(env_mtime: int) -> SaxoOAuthClient:
+    return SaxoOAuthClient(SaxoSettings.from_env())
+
+
+def _saxo_client() -> SaxoOAuthClient:
+    """Shared token-less client for building auth URLs, rebuilt only when .env changes on disk."""
+    load_env_file()
+    return _saxo_client_for(env_mtime())
+
+
+def _private_saxo_client(state: Optional[TokenState] = None) -> SaxoOAuthClient:
+    """
+    Per-request client seeded from ``state``. Token mutation never touches shared state;
+    refreshes go through SaxoOAuthClient.refresh_lock and any new token is persisted.
+    """
+    oauth = SaxoOAuthClient(SaxoSettings.from_env())
+    if state is not None and (state.access or state.refresh):
+        oauth.token = Token(
+            access_token=state.access or "",
+            refresh_token=state.refresh,
+            expires_at=state.expires_at if state.access else 0,
+            refresh_expires_at=state.refresh_expires_at or None,
+        )
+    oauth.on_token = _persist_saxo_tokens
+    return oauth
+
+
+def _refresh_saxo_tokens_if_possible(state: Optional[TokenState] = None) -> Optional[Dict[str, Any]]:
+    state = state or _saxo_token_state()
+    if not state.refresh:
         return None
-    settings = SaxoSettings.from_env()
-    oauth = SaxoOAuthClient(settings)
-    refresh_expires_raw = os.getenv("SAXO_REFRESH_TOKEN_EXPIRES_AT")
-    refresh_expires_at = float(refresh_expires_raw) if refresh_expires_raw else 0.0
-    oauth.token = Token(access_token="", refresh_token=refresh_token, expires_at=0, refresh_expires_at=refresh_expires_at)
+    oauth = _private_saxo_client(state)
+    # Forces a refresh unless another client already rotated the token in the meantime.
+    oauth.token.expires_at = 0
     oauth.refresh()
     if not oauth.token:
         return None
-    return _persist_saxo_tokens(oauth.token)
-
-
-def _saxo_token_state() -> Dict[str, Any]:
-    _load_env_file()
-    access = os.getenv("SAXO_ACCESS_TOKEN")
-    refresh = os.getenv("SAXO_REFRESH_TOKEN")
-    expires_raw = os.getenv("SAXO_TOKEN_EXPIRES_AT")
-    refresh_expires_raw = os.getenv("SAXO_REFRESH_TOKEN_EXPIRES_AT")
-    expires_at = float(expires_raw) if expires_raw else 0.0
-    refresh_expires_at = float(refresh_expires_raw) if refresh_expires_raw else 0.0
-    now = time.time()
-    expired = bool(expires_at) and now >= (expires_at - 30)
-    refresh_expired = bool(refresh_expires_at) and now >= (refresh_expires_at - 30)
-    refresh_expires_in = None
-    if refresh_expires_at:
-        refresh_expires_in = max(0, int(refresh_expires_at - now))
-    return {
-        "has_access_token": bool(access),
-        "has_refresh_token": bool(refresh),
-        "expires_at": int(expires_at) if expires_at else None,
-        "expired": expired,
-        "refresh_expires_at": int(refresh_expires_at) if refresh_expires_at else None,
-        "refresh_expired": refresh_expired,
-        "refresh_expires_in_seconds": refresh_expires_in,
-    }
+    return {"expires_at": oauth.token.expires_at, "refresh_expires_at": oauth.token.refresh_expires_at}
+
+
+# (valid_until, result) of the last successful token check; see _ensure_saxo_tokens.
+_token_check_cache: Tuple[float, Optional[str]] = (0.0, None)
+_TOKEN_CHECK_TTL = 30.0
+
+
+def _invalidate_token_check() -> None:
+    global _token_check_cache
+    _token_check_cache = (0.0, None)
+
+
+def _refresh_threshold() -> int:
+    return env_config().auto_refresh_threshold
 
 
-def _ensure_saxo_tokens() -> Optional[str]:
+def _ensure_saxo_tokens() -> Tuple[Optional[str], bool]:
+    """
+    Validate (and refresh if needed) Saxo tokens, reusing a recent OK result.
+    Returns (error, refreshed).
+    """
+    global _token_check_cache
+    valid_until, cached = _token_check_cache
+    if time.time() < valid_until:
+        return cached, False
+    error, refreshed = _check_saxo_tokens()
+    if error is None:
+        # Cache an OK result briefly, but never past the point the refresher would act.
+        state = _saxo_token_state()
+        ttl = _TOKEN_CHECK_TTL
+        if state.expires_at:
+            ttl = min(ttl, state.expires_at - _refresh_threshold() - state.checked_at)
+        if ttl > 0:
+            _token_check_cache = (state.checked_at + ttl, None)
+    return error, refreshed
+
+
+def _check_saxo_tokens() -> Tuple[Optional[str], bool]:
     state = _saxo_token_state()
-    if not state["has_access_token"] and not state["has_refresh_token"]:
-        return "Saxo???????????URL???????????"
-    if state.get("refresh_expired"):
-        return "???????????????????????????????"
-    if state["expired"] and not state["has_refresh_token"]:
-        return "Saxo???????????????????????????"
-    if (not state["has_access_token"] or state["expired"]) and state["has_refresh_token"]:
+    if not state.has_access_token and not state.has_refresh_token:
+        return "Saxo???????????URL???????????", False
+    if state.refresh_expired:
+        return "???????????????????????????????", False
+    if state.expired and not state.has_refresh_token:
+        return "Saxo???????????????????????????", False
+    if (not state.has_access_token or state.expired) and state.has_refresh_token:
         try:
-            _refresh_saxo_tokens_if_possible()
+            _refresh_saxo_tokens_if_possible(state)
         except Exception as exc:
-            return f"Saxo??????????????: {exc}"
+            return f"Saxo??????????????: {exc}", False
+        return None, True
+    return None, False
+
+
+def _start_or_noop(task: Optional[asyncio.Task], factory: Callable[[], Any]) -> asyncio.Task:
+    """Return ``task`` if it is still running, otherwise start ``factory()`` as a new task."""
+    # Check-and-create has no await in between, so it is atomic on the event loop.
+    if task is not None and not task.done():
+        return task
+    return asyncio.get_running_loop().create_task(factory())
+
+
+def _stop_background_task(task: Optional[asyncio.Task]) -> None:
+    """Cancel ``task`` if running; always returns None so callers can clear their handle."""
+    if task is not None and not task.done():
+        task.cancel()
     return None
 
 
+_token_refresh_task: Optional[asyncio.Task] = None
 
-_token_refresh_thread: Optional[threading.Thread] = None
 
+async def _token_refresh_loop(interval: int, threshold: int) -> None:
+    while True:
+        # Fall back to the polling interval when there is no usable deadline
+        # (no token yet, or the last refresh attempt failed).
+        sleep_for = float(interval)
+        try:
+            state = _saxo_token_state()
+            expires_at = state.expires_at
+            if expires_at and time.time() >= (expires_at - threshold):
+                await asyncio.to_thread(_refresh_saxo_tokens_if_possible, state)
+                _tokens.last_refresh_error = None
+                expires_at = _saxo_token_state().expires_at
+            deadline = expires_at - threshold
+            if expires_at and deadline > time.time():
+                sleep_for = max(1.0, deadline - time.time())
+        except Exception as exc:
+            _tokens.last_refresh_error = str(exc)
+        await asyncio.sleep(sleep_for)
 
-def _start_token_refresher_if_needed() -> None:
-    global _token_refresh_thread
-    if _token_refresh_thread is not None and _token_refresh_thread.is_alive():
-        return
 
+def _start_token_refresher_if_needed() -> None:
+    global _token_refresh_task
     interval = int(os.getenv("SAXO_REFRESH_LOOP_INTERVAL", "60"))
-    threshold = int(os.getenv("SAXO_AUTO_REFRESH_THRESHOLD", "120"))
-
-    def _loop() -> None:
-        while True:
-            try:
-                state = _saxo_token_state()
-                expires_at = state.get("expires_at") or 0
-                if expires_at and time.time() >= (float(expires_at) - threshold):
-                    _refresh_saxo_tokens_if_possible()
-            except Exception as exc:
-                os.environ["SAXO_REFRESH_FAILED"] = "true"
-                os.environ["SAXO_REFRESH_FAILED_REASON"] = str(exc)
-            time.sleep(interval)
-
-    _token_refresh_thread = threading.Thread(target=_loop, daemon=True)
-    _token_refresh_thread.start()
+    threshold = _refresh_threshold()
+    _token_refresh_task = _start_or_noop(_token_refresh_task, lambda: _token_refresh_loop(interval, threshold))
 
 app.add_middleware(
     CORSMiddleware,
@@ -176,22 +296,44 @@ app.add_middleware(
 
 # Keep a simple runtime error note for the UI
 _last_error: Optional[str] = None
-_stop_event = threading.Event()
-_bg_thread: Optional[threading.Thread] = None
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+# internal helper to run the scheduler task once; must be called on the event loop
+def _start_scheduler_if_needed() -> None:
+    global _scheduler_task
+    _scheduler_task = _start_or_noop(_scheduler_task, run_scheduler)
+
+
+async def _read(query: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a storage read on a pooled connection off the event loop."""
+
+    def _call() -> Any:
+        with app.state.db_ro.connection() as conn:
+            return query(conn, *args, **kwargs)
+
+    return await asyncio.to_thread(_call)
+
+
+async def _read_json(query: Callable[..., List[Dict[str, Any]]], **kwargs: Any) -> Response:
+    """
+    Like _read, but orjson-encodes the rows in the worker thread. The pooled connection is
+    back in the pool before any byte is sent, and a failed read is a 500, not a truncated 200.
+    """
+
+    def _call() -> bytes:
+        with app.state.db_ro.connection() as conn:
+            return orjson.dumps(query(conn, **kwargs))
 
+    return Response(await asyncio.to_thread(_call), media_type="application/json")
 
-# internal helper to run the scheduler thread once
-def _start_scheduler_if_needed():
-    global _bg_thread
-    if _bg_thread is None or not _bg_thread.is_alive():
-        _stop_event.clear()
-        _bg_thread = threading.Thread(target=run_scheduler, args=(_stop_event,), daemon=True)
-        _bg_thread.start()
 
 @app.on_event("startup")
-def init_db() -> None:
-    conn = connect_db(DB_PATH)
-    conn.close()
+async def init_db() -> None:
+    _saxo_token_state()  # prime the token store from .env
+
+    # Read-only pool for endpoints; connect_db creates the schema before marking each query_only.
+    app.state.db_ro = ConnectionPool(DB_PATH, size=os.cpu_count() or 4)
 
     # Auto-start scraping on server boot
     settings = runtime_config.load_settings()
@@ -202,34 +344,31 @@ def init_db() -> None:
     _start_token_refresher_if_needed()
 
 
+@app.on_event("shutdown")
+def close_db() -> None:
+    _stop_background_task(_scheduler_task)
+    _stop_background_task(_token_refresh_task)
+    app.state.db_ro.close()
+
+
 @app.get("/status")
-def status() -> Dict[str, Any]:
-    conn = connect_db(DB_PATH)
-    latest = get_latest_snapshot(conn)
-    latest_signal: Optional[Dict[str, Any]] = get_latest_trading_event(conn)
+async def status() -> Dict[str, Any]:
+    bundle = await _read(get_status_bundle)
 
     settings = runtime_config.load_settings()
 
     running = bool(settings.get("running", False))
-    last_scrape = None
-    last_new_segment = None
-    if latest:
-        last_scrape = latest.get("scraped_at")
-    if latest_signal:
-        last_new_segment = latest_signal.get("scraped_at")
-
-    conn.close()
 
     latency_ms = None  # not tracked yet
     scrape_health = get_scrape_health()
 
     return {
         "running": running,
-        "last_scrape": last_scrape,
-        "last_new_segment": last_new_segment,
+        "last_scrape": bundle["last_scrape"],
+        "last_new_segment": bundle["last_new_segment"],
         "poll_interval": settings.get("poll_interval", 15),
         "dry_run": bool(settings.get("dry_run", True)),
-        "latest_signal": latest_signal["segment_text"] if latest_signal else None,
+        "latest_signal": bundle["latest_signal"],
         "latency_ms": latency_ms,
         "last_error": _last_error or scrape_health.get("last_error"),
         "scrape_last_attempt": scrape_health.get("last_attempt"),
@@ -238,35 +377,35 @@ def status() -> Dict[str, Any]:
 
 
 @app.post("/bot/start")
-def bot_start() -> Dict[str, str]:
+async def bot_start() -> Dict[str, str]:
     global _last_error
-    token_error = _ensure_saxo_tokens()
+    token_error, refreshed = await asyncio.to_thread(_ensure_saxo_tokens)
     if token_error:
         _last_error = token_error
         raise HTTPException(status_code=401, detail=token_error)
-    try:
-        _refresh_saxo_tokens_if_possible()
-    except Exception as exc:
-        _last_error = str(exc)
+    state = _saxo_token_state()
+    # Top up only a token that is about to enter the refresh window; a fresh one is left alone.
+    if not refreshed and state.expires_at and state.expires_at - state.checked_at < _refresh_threshold():
+        try:
+            await asyncio.to_thread(_refresh_saxo_tokens_if_possible, state)
+        except Exception as exc:
+            _last_error = str(exc)
     settings = runtime_config.load_settings()
     settings["running"] = True
     runtime_config.save_settings(settings)
-    # kick scheduler thread if not running
-    global _bg_thread
-    if _bg_thread is None or not _bg_thread.is_alive():
-        _stop_event.clear()
-        _bg_thread = threading.Thread(target=run_scheduler, args=(_stop_event,), daemon=True)
-        _bg_thread.start()
+    _start_scheduler_if_needed()
     return {"status": "running"}
 
 
 @app.post("/bot/stop")
-def bot_stop() -> Dict[str, str]:
-    global _last_error
+async def bot_stop() -> Dict[str, str]:
+    global _last_error, _scheduler_task
     settings = runtime_config.load_settings()
     settings["running"] = False
     runtime_config.save_settings(settings)
-    _stop_event.set()
+    # Drop the handle right away so an immediate /bot/start is not fooled by a task still unwinding.
+    _scheduler_task = _stop_background_task(_scheduler_task)
+    _invalidate_token_check()
     _last_error = None
     return {"status": "stopped"}
 
@@ -274,7 +413,7 @@ def bot_stop() -> Dict[str, str]:
 @app.post("/bot/run-once")
 def bot_run_once() -> Dict[str, Any]:
     global _last_error
-    token_error = _ensure_saxo_tokens()
+    token_error, _ = _ensure_saxo_tokens()
     if token_error:
         _last_error = token_error
         raise HTTPException(status_code=401, detail=token_error)
@@ -288,11 +427,8 @@ def bot_run_once() -> Dict[str, Any]:
 
 
 @app.get("/signals")
-def list_signals(limit: int = 100) -> List[Dict[str, Any]]:
-    conn = connect_db(DB_PATH)
-    rows = get_all_trading_events(conn, limit=limit)
-    conn.close()
-    return rows
+async def list_signals(limit: int = 100) -> Response:
+    return await _read_json(get_all_trading_events, limit=limit)
 
 
 @app.get("/actions")
@@ -302,11 +438,8 @@ def list_actions(limit: int = 100) -> List[Dict[str, Any]]:
 
 
 @app.get("/raw")
-def list_raw(limit: int = 100) -> List[Dict[str, Any]]:
-    conn = connect_db(DB_PATH)
-    rows = get_recent_raw(conn, limit=limit)
-    conn.close()
-    return rows
+async def list_raw(limit: int = 100) -> Response:
+    return await _read_json(get_recent_raw, limit=limit)
 
 
 @app.get("/settings")
@@ -336,8 +469,8 @@ def update_settings(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 @app.get("/saxo/auth-url")
 def saxo_auth_url() -> Dict[str, Any]:
-    settings = SaxoSettings.from_env()
-    oauth = SaxoOAuthClient(settings)
+    oauth = _saxo_client()
+    settings = oauth.settings
     return {"url": oauth.authorization_url(), "redirect_uri": settings.redirect_uri, "environment": settings.environment}
 
 
@@ -346,13 +479,11 @@ def saxo_auth_exchange(payload: Dict[str, Any]) -> Dict[str, Any]:
     code = (payload or {}).get("code")
     if not code:
         raise HTTPException(status_code=400, detail="Missing code")
-    settings = SaxoSettings.from_env()
-    oauth = SaxoOAuthClient(settings)
+    oauth = _private_saxo_client()
     oauth.authenticate(str(code))
     if not oauth.token:
         raise HTTPException(status_code=500, detail="Token exchange failed")
-    meta = _persist_saxo_tokens(oauth.token)
-    return {"status": "ok", **meta}
+    return {"status": "ok", "expires_at": oauth.token.expires_at, "refresh_expires_at": oauth.token.refresh_expires_at}
 
 
 @app.post("/saxo/refresh")
@@ -368,8 +499,8 @@ def saxo_refresh() -> Dict[str, Any]:
 def saxo_health() -> Dict[str, Any]:
     details: Dict[str, Any] = {
         "env": os.getenv("SAXO_ENV", "sim"),
-        "has_access_token": bool(os.getenv("SAXO_ACCESS_TOKEN")),
-        "has_refresh_token": bool(os.getenv("SAXO_REFRESH_TOKEN")),
+        "has_access_token": False,
+        "has_refresh_token": False,
         "account_key": os.getenv("SAXO_ACCOUNT_KEY") or None,
         "client_key": os.getenv("SAXO_CLIENT_KEY") or None,
         "expires_at": None,
@@ -377,27 +508,14 @@ def saxo_health() -> Dict[str, Any]:
         "refresh_expires_at": None,
         "refresh_expired": False,
         "refresh_expires_in_seconds": None,
+        "last_refresh_error": _tokens.last_refresh_error,
     }
     try:
         state = _saxo_token_state()
-        details["expires_at"] = state["expires_at"]
-        details["expired"] = state["expired"]
-        details["refresh_expires_at"] = state.get("refresh_expires_at")
-        details["refresh_expired"] = state.get("refresh_expired")
-        details["refresh_expires_in_seconds"] = state.get("refresh_expires_in_seconds")
-        settings = SaxoSettings.from_env()
-        oauth = SaxoOAuthClient(settings)
-        token = os.getenv("SAXO_ACCESS_TOKEN")
-        refresh = os.getenv("SAXO_REFRESH_TOKEN")
-        expires_at = os.getenv("SAXO_TOKEN_EXPIRES_AT")
-        refresh_expires_at = os.getenv("SAXO_REFRESH_TOKEN_EXPIRES_AT")
-        if token:
-            oauth.token = Token(access_token=token, refresh_token=refresh, expires_at=float(expires_at or 0), refresh_expires_at=float(refresh_expires_at or 0))
-        elif refresh:
-            oauth.token = Token(access_token="", refresh_token=refresh, expires_at=0)
+        details.update(state.as_dict())
+        oauth = _private_saxo_client(state)
+        if not state.access and state.refresh:
             oauth.refresh()
-            if oauth.token:
-                _persist_saxo_tokens(oauth.token)
         broker = None
         if oauth.token:
             from src.brokers.saxo import SaxoBroker
@@ -415,13 +533,10 @@ def saxo_health() -> Dict[str, Any]:
     return details
 
 @app.get("/stats")
-def stats() -> Dict[str, Any]:
-    conn = connect_db(DB_PATH)
-    data = get_event_statistics(conn)
-    conn.close()
-    return data
+async def stats() -> Dict[str, Any]:
+    return await _read(get_event_statistics)
 
 
 @app.get("/orders")
-def orders(limit: int = 100) -> List[Dict[str, Any]]:
-    return list_recent_orders(limit=limit)
+async def orders(limit: int = 100) -> List[Dict[str, Any]]:
+    return await _read(list_executions, limit=limit)
@@ -1,16 +1,42 @@
 import logging
-import os
+import random
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import quote, urlencode
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.config.setting import SaxoSettings
+from src.env_file import env_config
 
 logger = logging.getLogger(__name__)
 
 
+def _build_session() -> requests.Session:
+    # Retry only covers idempotent methods (urllib3 default), so order POSTs are never replayed.
+    # raise_on_status=False hands the final 429/5xx back as a response instead of RetryError,
+    # so api_get can see an exhausted 429 and arm its rate-limit gate.
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Process-wide keep-alive session shared by every client instance.
+_session = _build_session()
+
+# Token POSTs are not covered by the adapter's Retry, so they back off here instead.
+_TOKEN_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_TOKEN_RETRY_BASE = 2.0
+
+
 @dataclass
 class Token:
     access_token: str
@@ -23,22 +49,47 @@ class Token:
         return time.time() >= self.expires_at - 30  # small buffer
 
 
+def body_excerpt(resp: requests.Response, limit: int = 512) -> str:
+    """First ``limit`` bytes of a response body, without decoding the whole payload."""
+    return resp.content[:limit].decode("utf-8", "replace")
+
+
 class SaxoOAuthClient:
     """Handles OAuth2 for Saxo OpenAPI (SIM/LIVE)."""
 
+    # Saxo refresh tokens are single-use, so refreshes are serialized across every client in
+    # the process (API requests, the broker, the refresher), not just within one instance.
+    refresh_lock = threading.RLock()
+
     def __init__(self, settings: SaxoSettings) -> None:
         self.settings = settings
         self.token: Optional[Token] = None
         self.auth_base = "https://sim.logonvalidation.net" if settings.environment == "sim" else "https://live.logonvalidation.net"
         self.api_base = settings.base_url
+        self.session = _session
+        query = urlencode(
+            {"response_type": "code", "client_id": settings.client_id, "redirect_uri": settings.redirect_uri},
+            quote_via=quote,
+        )
+        self._authorize_url = f"{self.auth_base}/authorize?{query}"
+        # monotonic() deadline set by a 429; GETs fail fast until it passes.
+        self._rate_limited_until = 0.0
+        # Bearer header reused until the access token rotates.
+        self._headers_token: Optional[str] = None
+        self._headers: Dict[str, str] = {}
+        # Set whenever a new token is stored so waiters (the refresher) can re-plan.
+        self._refresh_event = threading.Event()
+        self.last_refresh_error: Optional[str] = None
+        # Called with each newly stored token, e.g. to persist it to .env.
+        self.on_token: Optional[Callable[[Token], None]] = None
+        self.reload_config()
+
+    def reload_config(self) -> None:
+        """Re-read refresh settings from the environment (read once at construction)."""
+        self._refresh_disabled = env_config().refresh_disabled
 
     def authorization_url(self, state: str = "fxbot") -> str:
-        return (
-            f"{self.auth_base}/authorize?response_type=code"
-            f"&client_id={self.settings.client_id}"
-            f"&redirect_uri={self.settings.redirect_uri}"
-            f"&state={state}"
-        )
+        return f"{self._authorize_url}&state={quote(state, safe='')}"
 
     def authenticate(self, code: str) -> None:
         data = {
@@ -51,23 +102,57 @@ class SaxoOAuthClient:
         self._exchange_token(data)
 
     def refresh(self) -> None:
-        if not self.token or not self.token.refresh_token:
-            raise RuntimeError("No refresh_token available; re-run interactive auth")
-        data = {
-            "grant_type": "refresh_token",
-            "refresh_token": self.token.refresh_token,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
-        self._exchange_token(data)
+        with self.refresh_lock:
+            if not self.token or not self.token.refresh_token:
+                raise RuntimeError("No refresh_token available; re-run interactive auth")
+            if self._adopt_rotated_token():
+                return
+            data = {
+                "grant_type": "refresh_token",
+                "refresh_token": self.token.refresh_token,
+                "client_id": self.settings.client_id,
+                "client_secret": self.settings.client_secret,
+            }
+            self._exchange_token(data)
+
+    def wait_for_refresh(self, timeout: float) -> bool:
+        """Block until a new token is stored or ``timeout`` elapses; True if one was stored."""
+        stored = self._refresh_event.wait(timeout)
+        self._refresh_event.clear()
+        return stored
+
+    def adopt_persisted_token(self) -> None:
+        """Pick up a token another client (or a re-authorization) persisted since this one last stored."""
+        cfg = env_config()
+        current = self.token.refresh_token if self.token else None
+        if cfg.refresh_token and cfg.refresh_token != current:
+            with self.refresh_lock:
+                self._adopt_rotated_token()
+
+    def _adopt_rotated_token(self) -> bool:
+        """
+        Take over a token another client already persisted, instead of spending our
+        (now invalid) refresh token. Returns True when the adopted token needs no refresh.
+        """
+        cfg = env_config()
+        current = self.token.refresh_token if self.token else None
+        if not cfg.refresh_token or cfg.refresh_token == current:
+            return False
+        self.token = Token(
+            access_token=cfg.access_token,
+            refresh_token=cfg.refresh_token,
+            expires_at=cfg.expires_at,
+            refresh_expires_at=cfg.refresh_expires_at or None,
+        )
+        self._refresh_event.set()
+        return bool(cfg.access_token) and not self.token.is_expired
 
     def _exchange_token(self, data: Dict[str, str]) -> None:
         url = f"{self.auth_base}/token"
-        resp = requests.post(url, data=data, timeout=15)
-        logger.debug("POST %s -> %s", url, resp.status_code)
+        resp = self._post_with_retry(url, data, timeout=15)
         if resp.status_code < 200 or resp.status_code >= 300:
             raise RuntimeError(f"Token request failed: {resp.status_code}")
-        payload = resp.json()
+        payload = orjson.loads(resp.content)
         access = payload.get("access_token")
         refresh = payload.get("refresh_token")
         expires_in = payload.get("expires_in", 0)
@@ -86,34 +171,83 @@ class SaxoOAuthClient:
             expires_at=time.time() + int(expires_in or 0),
             refresh_expires_at=refresh_expires_at,
         )
+        logger.debug("Saxo token stored; expires in %s seconds", expires_in)
+        self._refresh_event.set()
+        if self.on_token is not None:
+            self.on_token(self.token)
+
+    def _post_with_retry(
+        self, url: str, data: Dict[str, str], timeout: float, max_attempts: int = 3
+    ) -> requests.Response:
+        for attempt in range(max_attempts - 1):
+            delay = _TOKEN_RETRY_BASE * 2**attempt + random.uniform(0, _TOKEN_RETRY_BASE)
+            try:
+                resp = self.session.post(url, data=data, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                logger.warning("POST %s failed (%s); retrying in %.1fs", url, exc, delay)
+            else:
+                logger.debug("POST %s -> %s", url, resp.status_code)
+                if resp.status_code not in _TOKEN_RETRY_STATUSES:
+                    return resp
+                retry_after = resp.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    # Callers hold the refresh lock, so never wait past our own maximum backoff.
+                    delay = min(float(retry_after), _TOKEN_RETRY_BASE * 2**max_attempts)
+                logger.warning("POST %s -> %s; retrying in %.1fs", url, resp.status_code, delay)
+            time.sleep(delay)
+        resp = self.session.post(url, data=data, timeout=timeout)
+        logger.debug("POST %s -> %s", url, resp.status_code)
+        return resp
 
     def get_access_token(self) -> str:
-        if not self.token:
+        token = self.token
+        if not token:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
-        disable_refresh = os.getenv("SAXO_DISABLE_REFRESH", "").strip().lower() in {"1", "true", "yes"}
-        if self.token.is_expired and not disable_refresh:
-            try:
-                self.refresh()
-            except Exception as exc:
-                raise RuntimeError(
-                    "Token refresh failed. Ensure SAXO_ENV and client credentials match the token environment, "
-                    "or re-authorize to obtain new tokens. "
-                    f"Original error: {exc}"
-                )
-        return self.token.access_token
-
-    def api_post(self, path: str, json: Optional[Dict[str, Any]] = None) -> requests.Response:
+        if not token.is_expired or self._refresh_disabled:
+            return token.access_token
+        with self.refresh_lock:
+            # Another caller may have refreshed while we waited for the lock.
+            if self.token is token:
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    raise RuntimeError(
+                        "Token refresh failed. Ensure SAXO_ENV and client credentials match the token environment, "
+                        "or re-authorize to obtain new tokens. "
+                        f"Original error: {exc}"
+                    )
+            return self.token.access_token
+
+    def _auth_headers(self) -> Dict[str, str]:
         token = self.get_access_token()
+        if token is not self._headers_token:
+            self._headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+            self._headers_token = token
+        return self._headers
+
+    def api_post(
+        self, path: str, json: Optional[Dict[str, Any]] = None, body: Optional[bytes] = None
+    ) -> requests.Response:
+        """POST ``json`` (encoded here) or an already-serialized JSON ``body``."""
+        headers = self._auth_headers()
         url = f"{self.api_base}{path}"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = requests.post(url, headers=headers, json=json, timeout=15)
+        if body is None and json is not None:
+            body = orjson.dumps(json)
+        resp = self.session.post(url, headers=headers, data=body, timeout=15)
         logger.debug("POST %s -> %s", url, resp.status_code)
         return resp
 
     def api_get(self, path: str, params: Optional[Dict[str, str]] = None) -> requests.Response:
-        token = self.get_access_token()
+        wait = self._rate_limited_until - time.monotonic()
+        if wait > 0:
+            raise RuntimeError(f"Saxo rate limit in effect; retry in {wait:.1f}s")
+        headers = self._auth_headers()
         url = f"{self.api_base}{path}"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
-        logger.debug("GET %s -> %s %s", url, resp.status_code, resp.text[:500])
+        resp = self.session.get(url, headers=headers, params=params, timeout=10)
+        if resp.status_code == 429:
+            # The adapter already retried; stop piling further reads onto the limit.
+            retry_after = resp.headers.get("Retry-After", "")
+            self._rate_limited_until = time.monotonic() + (float(retry_after) if retry_after.isdigit() else 1.0)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GET %s -> %s %s", url, resp.status_code, body_excerpt(resp))
         return resp
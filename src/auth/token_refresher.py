@@ -1,7 +1,6 @@
-﻿import os
+import os
 import threading
 import time
-from typing import Optional
 
 from src.auth.saxo_oauth import SaxoOAuthClient
 
@@ -13,19 +12,24 @@ def start_token_refresher(oauth: SaxoOAuthClient) -> threading.Thread:
 
     def _loop() -> None:
         while True:
-            try:
-                # Trigger refresh if within threshold
-                if oauth.access_token:
-                    if time.time() >= (oauth.expires_at - threshold):
-                        oauth.refresh_access_token()
-                else:
-                    # No token yet; sleep and wait
-                    pass
-            except Exception as exc:
-                # Optional: flag failure for downstream logic
-                os.environ["SAXO_REFRESH_FAILED"] = "true"
-                os.environ["SAXO_REFRESH_FAILED_REASON"] = str(exc)
-            time.sleep(interval)
+            token = oauth.token
+            if token is None:
+                # No token yet; wait for authenticate() to store one.
+                wait = float(interval)
+            else:
+                wait = token.expires_at - threshold - time.time()
+                if wait <= 0:
+                    try:
+                        oauth.refresh()
+                        oauth.last_refresh_error = None
+                        continue
+                    except Exception as exc:
+                        # Flag failure for downstream logic and back off before retrying.
+                        oauth.last_refresh_error = str(exc)
+                        wait = float(interval)
+                wait = max(1.0, wait)
+            # Sleep until the token nears expiry, or wake early when a new one is stored.
+            oauth.wait_for_refresh(wait)
 
     t = threading.Thread(target=_loop, daemon=True)
     t.start()
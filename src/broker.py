@@ -1,65 +1,12 @@
 import json
-import os
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 from src import runtime_config
+from src.env_file import env_config, queue_env_update
 from .config.setting import SaxoSettings
 from .auth.saxo_oauth import SaxoOAuthClient, Token
-
-
-@dataclass
-class BrokerResult:
-    ok: bool
-    order_id: Optional[str]
-    error: Optional[str]
-    payload: Optional[Dict[str, Any]]
-
-
-ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
-
-
-
-def _load_env_file() -> None:
-    if not ENV_PATH.exists():
-        return
-    for raw in ENV_PATH.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, val = line.split("=", 1)
-        os.environ[key] = val
-
-
-def _update_env_vars(updates: Dict[str, str]) -> None:
-    existing_lines = []
-    if ENV_PATH.exists():
-        existing_lines = ENV_PATH.read_text(encoding="utf-8").splitlines()
-
-    keys = set(updates.keys())
-    new_lines = []
-    seen = set()
-
-    for line in existing_lines:
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in stripped:
-            new_lines.append(line)
-            continue
-        key, _ = stripped.split("=", 1)
-        if key in updates:
-            new_lines.append(f"{key}={updates[key]}")
-            seen.add(key)
-        else:
-            new_lines.append(line)
-
-    for key in keys - seen:
-        new_lines.append(f"{key}={updates[key]}")
-
-    ENV_PATH.write_text("\n".join(new_lines) + "\n", encoding="utf-8")
-
-    for key, val in updates.items():
-        os.environ[key] = str(val)
+from .brokers.base import BrokerResult
 
 
 def _persist_saxo_tokens(token: Token) -> None:
@@ -71,32 +18,29 @@ def _persist_saxo_tokens(token: Token) -> None:
     updates["SAXO_TOKEN_EXPIRES_AT"] = str(int(token.expires_at))
     if getattr(token, "refresh_expires_at", None):
         updates["SAXO_REFRESH_TOKEN_EXPIRES_AT"] = str(int(token.refresh_expires_at))
-    _update_env_vars(updates)
+    queue_env_update(updates)
 
 
 def _load_oauth_from_env(oauth: SaxoOAuthClient) -> SaxoOAuthClient:
-    _load_env_file()
-    access = os.getenv("SAXO_ACCESS_TOKEN") or ""
-    refresh = os.getenv("SAXO_REFRESH_TOKEN")
-    expires_raw = os.getenv("SAXO_TOKEN_EXPIRES_AT")
-    refresh_expires_raw = os.getenv("SAXO_REFRESH_TOKEN_EXPIRES_AT")
-    expires_at = float(expires_raw) if expires_raw else 0.0
-    refresh_expires_at = float(refresh_expires_raw) if refresh_expires_raw else 0.0
+    cfg = env_config()
+    access = cfg.access_token
+    refresh = cfg.refresh_token
 
     if access or refresh:
-        oauth.token = Token(access_token=access, refresh_token=refresh, expires_at=expires_at, refresh_expires_at=refresh_expires_at)
-        disable_refresh = os.getenv("SAXO_DISABLE_REFRESH", "").strip().lower() in {"1", "true", "yes"}
+        oauth.token = Token(
+            access_token=access,
+            refresh_token=refresh,
+            expires_at=cfg.expires_at,
+            refresh_expires_at=cfg.refresh_expires_at,
+        )
         should_refresh = refresh and (not access or oauth.token.is_expired)
-        if should_refresh and not disable_refresh:
+        if should_refresh and not cfg.refresh_disabled:
             try:
                 oauth.refresh()
-                if oauth.token:
-                    _persist_saxo_tokens(oauth.token)
             except Exception as exc:
                 # If we still have an access token, proceed without refresh to avoid hard-fail.
                 if access:
-                    os.environ["SAXO_REFRESH_FAILED"] = "true"
-                    os.environ["SAXO_REFRESH_FAILED_REASON"] = str(exc)
+                    oauth.last_refresh_error = str(exc)
                 else:
                     raise RuntimeError(
                         "Saxo token refresh failed and no access token is available. "
@@ -123,16 +67,35 @@ def _load_uic_map(settings: dict) -> Dict[str, int]:
     return mapped
 
 
+@lru_cache(maxsize=1)
+def _saxo_broker(
+    settings: SaxoSettings,
+    account_key: Optional[str],
+    client_key: Optional[str],
+    uic_items: Tuple[Tuple[str, int], ...],
+):
+    oauth = SaxoOAuthClient(settings)
+    # The instance is long-lived, so refreshes it makes on its own must reach .env too.
+    oauth.on_token = _persist_saxo_tokens
+    oauth = _load_oauth_from_env(oauth)
+    from .brokers.saxo import SaxoBroker
+
+    return SaxoBroker(oauth, settings, account_key=account_key, client_key=client_key, uic_map=dict(uic_items))
+
+
 def get_broker(name: str):
+    """
+    Shared broker instance, rebuilt only when the app settings, account keys or UIC map change.
+    Token rotations are adopted in place so the positions snapshot and lookups survive them.
+    """
     name = (name or "").lower()
     if name in ("saxo", "", None):
-        settings = SaxoSettings.from_env()
-        oauth = SaxoOAuthClient(settings)
-        oauth = _load_oauth_from_env(oauth)
-        account_key = os.getenv("SAXO_ACCOUNT_KEY")
-        client_key = os.getenv("SAXO_CLIENT_KEY")
+        cfg = env_config()
         uic_map = _load_uic_map(runtime_config.load_settings())
-        from .brokers.saxo import SaxoBroker
-
-        return SaxoBroker(oauth, settings, account_key=account_key, client_key=client_key, uic_map=uic_map)
+        broker = _saxo_broker(
+            SaxoSettings.from_env(), cfg.account_key, cfg.client_key, tuple(sorted(uic_map.items()))
+        )
+        broker.oauth.reload_config()
+        broker.oauth.adopt_persisted_token()
+        return broker
     raise ValueError(f"Unsupported broker: {name}")
@@ -1,5 +1,14 @@
 ﻿import abc
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Optional
+
+
+@dataclass
+class BrokerResult:
+    ok: bool
+    order_id: Optional[str]
+    error: Optional[str]
+    payload: Optional[Dict[str, Any]]
 
 
 class BaseBroker(abc.ABC):
@@ -18,5 +27,10 @@ class BaseBroker(abc.ABC):
         ...
 
     @abc.abstractmethod
-    def get_price(self, symbol: str) -> Dict[str, Any]:
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Quote several symbols, keyed by symbol; each entry has a ``Quote`` block with Bid/Ask."""
         ...
+
+    def get_price(self, symbol: str) -> Dict[str, Any]:
+        """Single-symbol form of get_prices; empty when the broker returned no quote."""
+        return self.get_prices([symbol]).get(symbol, {})
@@ -1,10 +1,14 @@
 import logging
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
 
-from src.auth.saxo_oauth import SaxoOAuthClient
-from src.brokers.base import BaseBroker
+import orjson
+
+from src.auth.saxo_oauth import SaxoOAuthClient, body_excerpt
+from src.brokers.base import BaseBroker, BrokerResult
 
 logger = logging.getLogger(__name__)
 
@@ -12,12 +16,8 @@ logger = logging.getLogger(__name__)
 DEFAULT_USDJPY_UIC_ENV = "SAXO_USDJPY_UIC"
 
 
-@dataclass
-class SaxoResult:
-    ok: bool
-    order_id: Optional[str]
-    error: Optional[str]
-    payload: Optional[Dict[str, Any]]
+# Kept as an alias so order results are the same type the executor checks against.
+SaxoResult = BrokerResult
 
 
 class SaxoBroker(BaseBroker):
@@ -43,8 +43,34 @@ class SaxoBroker(BaseBroker):
             else:
                 usd_jpy_uic = os.getenv(DEFAULT_USDJPY_UIC_ENV)
         self.usd_jpy_uic = usd_jpy_uic
+        # Every spelling seen so far (symbol or UIC) -> UIC; mapped UICs resolve to themselves.
+        self._uic_lookup: Dict[Any, int] = {**self.uic_map, **{uic: uic for uic in self.uic_map.values()}}
+        # Account/client keys are fixed per instance, so the query dicts are built once.
+        self._balance_query = self._balance_params() or None
+        # Only PositionBase (Uic/Amount) is read, so skip the display and view field groups.
+        self._position_query = {**self._position_params(), "FieldGroups": "PositionBase"}
+        self._order_keys = self._order_params()
+        # Constant part of every precheck body, serialized once without its closing brace.
+        self._precheck_prefix = orjson.dumps(
+            {"AssetType": "FxSpot", "OrderType": "Market", "ManualOrder": True, **self._order_keys}
+        )[:-1]
+        # Last batched /positions snapshot; per-UIC lookups reuse it until it expires.
+        self._positions: Dict[int, int] = {}
+        self._positions_fetched_at: Optional[float] = None
+        self._positions_expires_at = 0.0
+        self._positions_lock = threading.RLock()
+        self._positions_ttl = float(os.getenv("SAXO_POSITIONS_TTL_S", "2.0"))
+        # How old a snapshot may be and still stand in for a failed refresh.
+        self._positions_max_stale = float(os.getenv("SAXO_POSITIONS_MAX_STALE_S", "30"))
 
     def _resolve_uic(self, symbol_or_uic: Optional[str | int]) -> int:
+        uic = self._uic_lookup.get(symbol_or_uic)
+        if uic is None:
+            uic = self._resolve_uic_slow(symbol_or_uic)
+            self._uic_lookup[symbol_or_uic] = uic
+        return uic
+
+    def _resolve_uic_slow(self, symbol_or_uic: Optional[str | int]) -> int:
         if symbol_or_uic is None:
             raise ValueError("Missing instrument/UIC")
         if isinstance(symbol_or_uic, int):
@@ -52,7 +78,7 @@ class SaxoBroker(BaseBroker):
         raw = str(symbol_or_uic).strip()
         if raw.isdigit():
             return int(raw)
-        symbol = raw.upper().replace("_", "")
+        symbol = _symbol_key(raw)
         if symbol in self.uic_map:
             return int(self.uic_map[symbol])
         if symbol == "USDJPY":
@@ -62,14 +88,14 @@ class SaxoBroker(BaseBroker):
 
     def _handle_response(self, resp) -> Dict[str, Any]:
         if resp.status_code == 200:
-            return resp.json()
+            return orjson.loads(resp.content)
         if resp.status_code == 401:
             raise PermissionError("401 Unauthorized: check token scope.")
         if resp.status_code == 403:
             raise PermissionError("403 Forbidden: insufficient privileges or wrong environment.")
         if resp.status_code == 404:
             raise FileNotFoundError("404 Not Found: verify endpoint or account.")
-        raise RuntimeError(f"Unexpected status {resp.status_code}: {resp.text}")
+        raise RuntimeError(f"Unexpected status {resp.status_code}: {body_excerpt(resp)}")
 
     def _balance_params(self) -> Dict[str, str]:
         if self.client_key:
@@ -97,8 +123,7 @@ class SaxoBroker(BaseBroker):
         return self._handle_response(resp)
 
     def get_balance(self) -> Dict[str, Any]:
-        params = self._balance_params()
-        resp = self.oauth.api_get("/port/v1/balances", params=params or None)
+        resp = self.oauth.api_get("/port/v1/balances", params=self._balance_query)
         return self._handle_response(resp)
 
     def get_equity(self) -> Optional[float]:
@@ -106,37 +131,61 @@ class SaxoBroker(BaseBroker):
         return _extract_equity(data)
 
     def get_positions(self) -> Dict[str, Any]:
-        params = self._position_params()
-        resp = self.oauth.api_get("/port/v1/positions", params=params or None)
+        resp = self.oauth.api_get("/port/v1/positions", params=self._position_query)
         return self._handle_response(resp)
 
     def refresh_positions(self) -> Dict[int, int]:
-        payload = self.get_positions()
-        return _extract_positions(payload)
+        with self._positions_lock:
+            try:
+                payload = self.get_positions()
+            except Exception as exc:
+                # Ride out a transient failure on the last good snapshot if it is recent enough.
+                fetched_at = self._positions_fetched_at
+                if fetched_at is None or time.monotonic() - fetched_at > self._positions_max_stale:
+                    raise
+                logger.warning("Positions refresh failed, reusing snapshot: %s", exc)
+                self._positions_expires_at = time.monotonic() + self._positions_ttl
+                return self._positions
+            now = time.monotonic()
+            self._positions = _extract_positions(payload)
+            self._positions_fetched_at = now
+            self._positions_expires_at = now + self._positions_ttl
+            return self._positions
 
     def get_open_position_units(self, uic: int | str) -> int:
-        positions = self.refresh_positions()
         resolved = self._resolve_uic(uic)
+        positions = self._positions
+        if time.monotonic() >= self._positions_expires_at:
+            with self._positions_lock:
+                # Concurrent callers wait for one fetch instead of each issuing their own.
+                if time.monotonic() >= self._positions_expires_at:
+                    self.refresh_positions()
+                positions = self._positions
         return int(positions.get(int(resolved), 0))
 
-    def get_price(self, symbol: str) -> Dict[str, Any]:
-        uic = self._resolve_uic(symbol)
-        params = {"Uics": uic, "AssetType": "FxSpot"}
-        resp = self.oauth.api_get("/trade/v1/prices", params=params)
-        return self._handle_response(resp)
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Quote a basket of instruments with one /infoprices/list request, keyed by symbol."""
+        by_uic: Dict[int, str] = {}
+        for symbol in symbols:
+            by_uic.setdefault(self._resolve_uic(symbol), symbol)
+        if not by_uic:
+            return {}
+        params = {"Uics": ",".join(map(str, by_uic)), "AssetType": "FxSpot", "FieldGroups": "Quote"}
+        resp = self.oauth.api_get("/trade/v1/infoprices/list", params=params)
+        data = self._handle_response(resp)
+        prices: Dict[str, Dict[str, Any]] = {}
+        for item in data.get("Data") or ():
+            symbol = by_uic.get(item.get("Uic")) if isinstance(item, dict) else None
+            if symbol is not None:
+                prices[symbol] = item
+        return prices
 
     def precheck_order(self, uic: int, direction: str, units: int) -> Optional[float]:
-        payload: Dict[str, Any] = {
-            "Uic": int(uic),
-            "AssetType": "FxSpot",
-            "Amount": int(abs(units)),
-            "BuySell": "Buy" if direction.upper() == "BUY" else "Sell",
-            "OrderType": "Market",
-            "ManualOrder": True,
-        }
-        payload.update(self._order_params())
+        # Called repeatedly by the max-units search, so only the varying fields are encoded.
+        buy_sell = _buy_sell(direction).encode()
+        body = self._precheck_prefix + b',"Uic":%d,"Amount":%d,"BuySell":"%s"}' % (int(uic), int(abs(units)), buy_sell)
         try:
-            resp = self.oauth.api_post("/trade/v2/orders/precheck", json=payload)
+            resp = self.oauth.api_post("/trade/v2/orders/precheck", body=body)
             data = self._handle_response(resp)
         except Exception:
             return None
@@ -161,21 +210,23 @@ class SaxoBroker(BaseBroker):
                 "Uic": int(uic),
                 "AssetType": "FxSpot",
                 "Amount": int(abs(units)),
-                "BuySell": "Buy" if side.upper() == "BUY" else "Sell",
+                "BuySell": _buy_sell(side),
                 "OrderType": "Market",
                 "ManualOrder": True,
+                **self._order_keys,
             }
             if client_id:
                 payload["ExternalReference"] = client_id
-            payload.update(self._order_params())
 
         if dry_run:
             return SaxoResult(True, None, None, payload)
 
         resp = self.oauth.api_post("/trade/v2/orders", json=payload)
         if 200 <= resp.status_code < 300:
+            # The fill changes positions; don't serve the pre-order snapshot.
+            self._positions_expires_at = 0.0
             try:
-                data = resp.json() if resp.text else {}
+                data = orjson.loads(resp.content) if resp.content else {}
             except Exception:
                 data = {}
             order_id = None
@@ -188,7 +239,24 @@ class SaxoBroker(BaseBroker):
             return SaxoResult(False, None, "403 Forbidden: insufficient privileges or wrong environment.", None)
         if resp.status_code == 404:
             return SaxoResult(False, None, "404 Not Found: verify endpoint or account.", None)
-        return SaxoResult(False, None, f"Unexpected status {resp.status_code}: {resp.text}", None)
+        return SaxoResult(False, None, f"Unexpected status {resp.status_code}: {body_excerpt(resp)}", None)
+
+
+# Executor sides are already upper-case, so the common case is one dict hit.
+_BUY_SELL = {"BUY": "Buy", "SELL": "Sell"}
+
+
+def _buy_sell(side: str) -> str:
+    buy_sell = _BUY_SELL.get(side)
+    if buy_sell is None:
+        buy_sell = "Buy" if side.upper() == "BUY" else "Sell"
+    return buy_sell
+
+
+@lru_cache(maxsize=256)
+def _symbol_key(raw: str) -> str:
+    # The pair universe is small and fixed, so every order after the first hits the cache.
+    return raw.upper().replace("_", "")
 
 
 def _load_default_uic() -> str:
@@ -200,33 +268,38 @@ def _load_default_uic() -> str:
     return uic
 
 
-def _extract_equity(data: Dict[str, Any]) -> Optional[float]:
-    if not isinstance(data, dict):
+# Common shapes: {Balance:{TotalValue:...}} or {TotalValue:...}, optionally under Balances[].
+_BALANCE_EQUITY_KEYS = ("TotalValue", "AccountValue", "CashBalance", "Balance")
+_TOP_EQUITY_KEYS = ("TotalValue", "TotalEquity", "NetEquity", "AccountValue", "CashBalance")
+
+
+def _equity_from(obj: Any, keys: tuple) -> Optional[float]:
+    if not isinstance(obj, dict):
         return None
+    for key in keys:
+        val = obj.get(key)
+        if isinstance(val, (int, float)):
+            return float(val)
+        if isinstance(val, dict):
+            for sub in ("Value", "Amount"):
+                if isinstance(val.get(sub), (int, float)):
+                    return float(val[sub])
+    return None
 
-    # Common shapes: {Balance:{TotalValue:...}} or {TotalValue:...}
-    candidates = [
-        (data.get("Balance"), ["TotalValue", "AccountValue", "CashBalance", "Balance"]),
-        (data, ["TotalValue", "TotalEquity", "NetEquity", "AccountValue", "CashBalance"]),
-    ]
-    for obj, keys in candidates:
-        if isinstance(obj, dict):
-            for key in keys:
-                val = obj.get(key)
-                if isinstance(val, (int, float)):
-                    return float(val)
-                if isinstance(val, dict):
-                    for sub in ("Value", "Amount"):
-                        if isinstance(val.get(sub), (int, float)):
-                            return float(val[sub])
 
+def _extract_equity(data: Dict[str, Any]) -> Optional[float]:
+    if not isinstance(data, dict):
+        return None
     balances = data.get("Balances")
-    if isinstance(balances, list) and balances:
-        for item in balances:
-            if isinstance(item, dict):
-                val = _extract_equity(item)
-                if val is not None:
-                    return val
+    items = [data]
+    if isinstance(balances, list):
+        items.extend(item for item in balances if isinstance(item, dict))
+    for item in items:
+        val = _equity_from(item.get("Balance"), _BALANCE_EQUITY_KEYS)
+        if val is None:
+            val = _equity_from(item, _TOP_EQUITY_KEYS)
+        if val is not None:
+            return val
     return None
 
 
@@ -250,8 +323,9 @@ def _extract_positions(payload: Dict[str, Any]) -> Dict[int, int]:
         if uic is None or amount is None:
             continue
         try:
-            positions[int(uic)] = int(amount)
-        except Exception:
+            # orjson yields int for whole-number amounts; only other shapes need converting.
+            positions[uic if type(uic) is int else int(uic)] = amount if type(amount) is int else int(float(amount))
+        except (TypeError, ValueError):
             continue
     return positions
 
@@ -3,9 +3,12 @@ Runtime configuration utilities for Saxo OpenAPI access.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
+from src.env_file import env_mtime, load_env_file
+
 # Load .env file
 load_dotenv()
 
@@ -43,17 +46,27 @@ def _require(name: str) -> str:
     return value
 
 
+# (REST gateway, OAuth host) per environment; anything other than "live" is SIM.
+_ENDPOINTS = {
+    "live": ("https://gateway.saxobank.com/openapi", "https://live.logonvalidation.net"),
+    "sim": ("https://gateway.saxobank.com/sim/openapi", "https://sim.logonvalidation.net"),
+}
+
+
 def _base_url(env: str) -> str:
-    if env == "live":
-        return "https://gateway.saxobank.com/openapi"
-    return "https://gateway.saxobank.com/sim/openapi"
+    return _ENDPOINTS.get(env, _ENDPOINTS["sim"])[0]
 
 
 def _auth_base(env: str) -> str:
-    if env == "live":
-        return "https://live.logonvalidation.net"
-    return "https://sim.logonvalidation.net"
+    return _ENDPOINTS.get(env, _ENDPOINTS["sim"])[1]
 
 
-def load_saxo_settings() -> SaxoSettings:
+@lru_cache(maxsize=1)
+def _saxo_settings_for(mtime: int) -> SaxoSettings:
     return SaxoSettings.from_env()
+
+
+def load_saxo_settings() -> SaxoSettings:
+    """SaxoSettings from the environment, rebuilt only when .env changes on disk."""
+    load_env_file()
+    return _saxo_settings_for(env_mtime())
@@ -3,22 +3,54 @@ Debug script to inspect the talk list page and find thread titles.
 This helps troubleshoot issues with finding and clicking talk threads.
 """
 import os
+import re
 import time
 from dotenv import load_dotenv
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 
-def visible(el) -> bool:
-    try:
-        return el.is_displayed()
-    except Exception:
-        return False
+_KEYWORDS = ["エントリー", "決済", "タイミング"]
+_KW_RE = re.compile("|".join(map(re.escape, _KEYWORDS)))
+
+# In-page stand-in for WebElement.is_displayed(), so visibility costs no WebDriver round trip.
+_IS_SHOWN_JS = """
+const isShown = e => {
+    const r = e.getBoundingClientRect();
+    if (!r.width || !r.height) return false;
+    const st = getComputedStyle(e);
+    return st.display !== "none" && st.visibility !== "hidden" && st.opacity !== "0";
+};
+"""
+
+# Describes every match in one execute_script call instead of ~5 WebDriver round trips per element.
+_DESCRIBE_JS = _IS_SHOWN_JS + """
+return [...document.querySelectorAll(arguments[0])].map(e => ({
+    tag: e.tagName.toLowerCase(),
+    text: (e.innerText || "").trim(),
+    cls: e.getAttribute("class") || "",
+    href: e.href || e.getAttribute("href") || "",
+    visible: isShown(e),
+}));
+"""
+
+# Short visible divs containing any keyword among the first 100, filtered in-page so no
+# div handles cross the wire and innerText is only read for the capped slice.
+_MATCHING_DIVS_JS = _IS_SHOWN_JS + """
+const kws = arguments[0];
+return [...document.querySelectorAll("div")].slice(0, 100).filter(d => {
+    const t = (d.innerText || "").trim();
+    return t && t.length < 200 && kws.some(k => t.includes(k)) && isShown(d);
+}).map(d => ({text: d.innerText.trim(), cls: d.getAttribute("class") || ""}));
+"""
+
+
+def _batch_describe(driver, css: str) -> list:
+    return driver.execute_script(_DESCRIBE_JS, css) or []
 
 
 def main():
@@ -37,12 +69,15 @@ def main():
     
     options = webdriver.ChromeOptions()
     options.add_argument("--window-size=1400,900")
+    # The inspector only reads DOM text and attributes: return at DOMContentLoaded and skip images.
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     
     driver = webdriver.Chrome(
         service=Service(ChromeDriverManager().install()),
         options=options,
     )
-    wait = WebDriverWait(driver, 60)
+    wait = WebDriverWait(driver, 60, poll_frequency=0.1)
     
     try:
         # Open the site
@@ -58,19 +93,23 @@ def main():
         print("ALL CLICKABLE ELEMENTS (a, button, [role='button'])")
         print("=" * 80)
         
-        all_clickables = driver.find_elements(By.CSS_SELECTOR, "a, button, [role='button']")
+        all_clickables = _batch_describe(driver, ":is(a, button, [role='button'])")
         print(f"\n[INFO] Found {len(all_clickables)} clickable elements\n")
         
+        # One pass prints every visible element and collects keyword matches for the next section.
         visible_count = 0
-        for i, elem in enumerate(all_clickables):
-            if not visible(elem):
+        matches = []
+        for elem in all_clickables:
+            if not elem["visible"]:
                 continue
             
             visible_count += 1
-            text = (elem.text or "").strip()
-            tag = elem.tag_name
-            classes = elem.get_attribute("class") or ""
-            href = elem.get_attribute("href") or ""
+            text = elem["text"]
+            tag = elem["tag"]
+            classes = elem["cls"]
+            href = elem["href"]
+            if _KW_RE.search(text):
+                matches.append(elem)
             
             if text or href:
                 print(f"[{visible_count}] {tag.upper()}")
@@ -91,23 +130,14 @@ def main():
         print("ELEMENTS CONTAINING 'エントリー' OR '決済' OR 'タイミング'")
         print("=" * 80 + "\n")
         
-        keywords = ["エントリー", "決済", "タイミング"]
-        found_count = 0
-        
-        for elem in all_clickables:
-            if not visible(elem):
-                continue
-            
-            text = (elem.text or "").strip()
-            if any(kw in text for kw in keywords):
-                found_count += 1
-                print(f"[Match {found_count}] {elem.tag_name.upper()}")
-                print(f"    Text: {text}")
-                print(f"    Classes: {elem.get_attribute('class') or 'None'}")
-                print()
+        for found_count, elem in enumerate(matches, 1):
+            print(f"[Match {found_count}] {elem['tag'].upper()}")
+            print(f"    Text: {elem['text']}")
+            print(f"    Classes: {elem['cls'] or 'None'}")
+            print()
         
         print("=" * 80)
-        print(f"[INFO] Found {found_count} elements matching keywords")
+        print(f"[INFO] Found {len(matches)} elements matching keywords")
         print("=" * 80)
         
         # Check for div elements with text content
@@ -115,23 +145,16 @@ def main():
         print("ALL DIV ELEMENTS WITH TEXT CONTENT")
         print("=" * 80 + "\n")
         
-        all_divs = driver.find_elements(By.CSS_SELECTOR, "div")
-        div_count = 0
+        matching_divs = driver.execute_script(_MATCHING_DIVS_JS, _KEYWORDS) or []
         
-        for div in all_divs[:100]:  # Limit to first 100 visible divs
-            if not visible(div):
-                continue
-            
-            text = (div.text or "").strip()
-            if text and len(text) < 200 and any(kw in text for kw in keywords):
-                div_count += 1
-                print(f"[Div {div_count}]")
-                print(f"    Text: {text}")
-                print(f"    Classes: {div.get_attribute('class') or 'None'}")
-                print()
+        for div_count, div in enumerate(matching_divs, 1):
+            print(f"[Div {div_count}]")
+            print(f"    Text: {div['text']}")
+            print(f"    Classes: {div['cls'] or 'None'}")
+            print()
         
         print("=" * 80)
-        print(f"[INFO] Found {div_count} divs matching keywords")
+        print(f"[INFO] Found {len(matching_divs)} divs matching keywords")
         print("=" * 80)
         
         # Try JavaScript inspection
@@ -140,7 +163,8 @@ def main():
         print("=" * 80 + "\n")
         
         body_text = driver.execute_script("return document.body.innerText;")
-        if "エントリー" in body_text and "決済" in body_text and "タイミング" in body_text:
+        found_keywords = set(_KW_RE.findall(body_text))
+        if len(found_keywords) == len(_KEYWORDS):
             print("[INFO] ✓ All keywords found in page text!")
             
             # Find the context around the keywords
@@ -155,12 +179,9 @@ def main():
                         print(f"{marker}{lines[j]}")
         else:
             print("[WARNING] Not all keywords found in page text")
-            if "エントリー" in body_text:
-                print("  ✓ Found: エントリー")
-            if "決済" in body_text:
-                print("  ✓ Found: 決済")
-            if "タイミング" in body_text:
-                print("  ✓ Found: タイミング")
+            for keyword in _KEYWORDS:
+                if keyword in found_keywords:
+                    print(f"  ✓ Found: {keyword}")
         
         print("\n" + "=" * 80)
         
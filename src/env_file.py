@@ -0,0 +1,156 @@
+import atexit
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+# One KEY=value assignment per line; comments and blank lines never match.
+_ENV_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*?)[ \t\r]*$", re.MULTILINE)
+
+# Parsed .env contents, keyed on the file's mtime so unchanged files are not re-read.
+# ``text`` is kept verbatim so rewrites preserve comments and ordering.
+_env_cache: Dict[str, Any] = {"mtime": 0, "data": {}, "text": ""}
+
+
+def load_env_file() -> Dict[str, str]:
+    """Parse .env into a dict (and os.environ), re-reading only when its mtime changes."""
+    try:
+        mtime = ENV_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return _env_cache["data"]
+    if mtime == _env_cache["mtime"]:
+        return _env_cache["data"]
+    text = ENV_PATH.read_text(encoding="utf-8")
+    data = dict(_ENV_RE.findall(text))
+    os.environ.update(data)
+    _env_cache.update(mtime=mtime, data=data, text=text)
+    return data
+
+
+def env_mtime() -> int:
+    """mtime (ns) of the .env contents currently held in the cache."""
+    return _env_cache["mtime"]
+
+
+def env_value(env: Dict[str, str], key: str) -> Optional[str]:
+    val = env.get(key)
+    return val if val is not None else os.getenv(key)
+
+
+def update_env_vars(updates: Dict[str, Any]) -> None:
+    """Merge ``updates`` into .env, skipping the write when no value changed."""
+    env = load_env_file()
+    values = {key: str(val) for key, val in updates.items()}
+    os.environ.update(values)
+    changed = {key: val for key, val in values.items() if env.get(key) != val}
+    if not changed:
+        return
+
+    # Only the write path walks individual lines, to patch keys in place.
+    lines = _env_cache["text"].splitlines()
+    pending = dict(changed)
+    for pos, line in enumerate(lines):
+        key, sep, _ = line.partition("=")
+        key = key.strip()
+        if sep and key in changed:
+            lines[pos] = f"{key}={changed[key]}"
+            pending.pop(key, None)
+    lines.extend(f"{key}={val}" for key, val in pending.items())
+    text = "\n".join(lines) + "\n"
+
+    # Write a sibling temp file and swap it in so readers never see a torn .env.
+    tmp_path = ENV_PATH.with_name(ENV_PATH.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, ENV_PATH)
+    _env_cache.update(mtime=ENV_PATH.stat().st_mtime_ns, data={**env, **changed}, text=text)
+
+
+# Writes deferred off the token-refresh path, coalesced by one flusher thread.
+_FLUSH_DEBOUNCE = 0.25
+_pending: Dict[str, str] = {}
+_pending_generation = 0
+_pending_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flusher: Optional[threading.Thread] = None
+
+
+def queue_env_update(updates: Dict[str, Any]) -> None:
+    """Apply ``updates`` to os.environ now and persist them to .env in the background."""
+    global _flusher, _pending_generation
+    values = {key: str(val) for key, val in updates.items()}
+    os.environ.update(values)
+    with _pending_lock:
+        _pending.update(values)
+        _pending_generation += 1
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="env-flusher", daemon=True)
+            _flusher.start()
+    _flush_wakeup.set()
+
+
+def flush_env_updates() -> None:
+    """Write any queued updates to .env now."""
+    with _pending_lock:
+        if _pending:
+            update_env_vars(_pending)
+            _pending.clear()
+
+
+def _flush_loop() -> None:
+    while True:
+        _flush_wakeup.wait()
+        time.sleep(_FLUSH_DEBOUNCE)
+        _flush_wakeup.clear()
+        flush_env_updates()
+
+
+atexit.register(flush_env_updates)
+
+
+@dataclass(frozen=True, slots=True)
+class EnvConfig:
+    """Typed Saxo settings parsed from .env, rebuilt only when the file changes."""
+
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: float
+    refresh_expires_at: float
+    refresh_disabled: bool
+    auto_refresh_threshold: int
+    account_key: Optional[str]
+    client_key: Optional[str]
+
+
+def _float(raw: Optional[str]) -> float:
+    try:
+        return float(raw) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+@lru_cache(maxsize=1)
+def _env_config_for(mtime: int, generation: int) -> EnvConfig:
+    env = {**_env_cache["data"], **_pending}
+    return EnvConfig(
+        access_token=env_value(env, "SAXO_ACCESS_TOKEN") or "",
+        refresh_token=env_value(env, "SAXO_REFRESH_TOKEN") or None,
+        expires_at=_float(env_value(env, "SAXO_TOKEN_EXPIRES_AT")),
+        refresh_expires_at=_float(env_value(env, "SAXO_REFRESH_TOKEN_EXPIRES_AT")),
+        refresh_disabled=(env_value(env, "SAXO_DISABLE_REFRESH") or "").strip().lower() in {"1", "true", "yes"},
+        auto_refresh_threshold=int(env_value(env, "SAXO_AUTO_REFRESH_THRESHOLD") or "120"),
+        account_key=env_value(env, "SAXO_ACCOUNT_KEY") or None,
+        client_key=env_value(env, "SAXO_CLIENT_KEY") or None,
+    )
+
+
+def env_config() -> EnvConfig:
+    """Current EnvConfig (including queued writes); one stat() unless .env changed."""
+    load_env_file()
+    return _env_config_for(env_mtime(), _pending_generation)
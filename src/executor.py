@@ -1,8 +1,13 @@
-import json
 import os
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache, wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 from .broker import BrokerResult, get_broker
 from src import runtime_config
@@ -10,25 +15,61 @@ from .storage import (
     DB_PATH,
     clear_baseline_units,
     connect_db,
+    executed_hashes,
     get_all_trading_events,
     get_baseline_units,
     get_daily_equity,
+    get_latest_batch_events,
+    get_latest_trading_event_id,
     get_recent_executions,
-    list_executions,
     record_execution,
+    record_skipped_executions,
     set_baseline_units,
     set_daily_equity,
-    was_executed,
-    was_executed_recent,
 )
 
 
+# Broker reads issued concurrently within a cycle; the shared HTTP session is pooled.
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="executor-io")
+
+# One SQLite connection for the process instead of a connect/close per cycle. Cycles are
+# reached from both the scheduler thread and /bot/run-once, so callers hold _conn_lock.
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.RLock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = connect_db(DB_PATH)
+    return _conn
+
+
+def _with_db(func):
+    """Serialize ``func`` on the shared connection and commit anything it left open."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _conn_lock:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _conn is not None and _conn.in_transaction:
+                    _conn.commit()
+
+    return wrapper
+
+
 ALLOWED_UICS = {
     "EURUSD": 21,
     "USDJPY": 22,
     "GBPUSD": 23,
 }
 
+_CLOSE_ACTIONS = frozenset({"CLOSE_TP", "CLOSE_SL"})
+_ACTIONS = _CLOSE_ACTIONS | {"ENTRY"}
+_SIDES = frozenset({"BUY", "SELL"})
+
 
 
 
@@ -45,11 +86,23 @@ def _normalize_uic_map(raw: Any) -> Dict[str, int]:
             continue
     return mapped
 
+@lru_cache(maxsize=256)
+def _instrument_key(instrument: str) -> str:
+    return instrument.upper().replace("/", "")
+
+
+def _opposes(existing_units: int, units: int) -> bool:
+    # Both are ints, so their XOR is negative exactly when the signs differ.
+    return bool(existing_units) and (existing_units ^ units) < 0
+
+
 def _stop(reason: str) -> None:
     print(f"STOP: {reason}")
     raise SystemExit(1)
 
 
+# The latest scrape batch is re-read every cycle, so the same timestamps recur until it changes.
+@lru_cache(maxsize=1024)
 def _parse_timestamp(value: Any) -> Optional[datetime]:
     if value is None:
         return None
@@ -61,6 +114,11 @@ def _parse_timestamp(value: Any) -> Optional[datetime]:
             return datetime.fromtimestamp(int(text), tz=timezone.utc)
         except Exception:
             return None
+    try:
+        # Stored timestamps are datetime.isoformat() output, which parses without rewriting.
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
     try:
         return datetime.fromisoformat(text.replace("Z", "+00:00"))
     except Exception:
@@ -68,7 +126,7 @@ def _parse_timestamp(value: Any) -> Optional[datetime]:
 
 
 def _find_max_units(broker, uic: int, direction: str, equity: float, max_units: int) -> Optional[int]:
-    if max_units <= 0:
+    if max_units <= 0 or not hasattr(broker, "precheck_order"):
         return None
 
     high = max_units
@@ -76,17 +134,27 @@ def _find_max_units(broker, uic: int, direction: str, equity: float, max_units:
     last_ok = None
 
     # Quick check at max_units
-    margin = broker.precheck_order(uic, direction, high) if hasattr(broker, "precheck_order") else None
+    margin = broker.precheck_order(uic, direction, high)
     if margin is not None and margin <= equity:
         return high
     if margin is None:
         high = max(high // 2, 0)
+    elif margin > 0:
+        # FxSpot margin is close to linear in units, so the rejected quote already prices one
+        # unit: confirm the implied cap with one precheck and only bisect below it if that fails.
+        high = min(int(equity * max_units / margin), max_units - 1)
+        if high <= 0:
+            return None
+        margin = broker.precheck_order(uic, direction, high)
+        if margin is not None and margin <= equity:
+            return high
+        high -= 1
 
     while low <= high:
         mid = (low + high) // 2
         if mid == 0:
             return last_ok
-        margin = broker.precheck_order(uic, direction, mid) if hasattr(broker, "precheck_order") else None
+        margin = broker.precheck_order(uic, direction, mid)
         if margin is None:
             high = mid - 1
             continue
@@ -99,6 +167,96 @@ def _find_max_units(broker, uic: int, direction: str, equity: float, max_units:
     return last_ok
 
 
+def _check_signal(
+    sig: Dict[str, Any],
+    uic_map: Dict[str, int],
+    allowed_pairs: Optional[List[str]],
+    now_utc: datetime,
+    freshness_seconds: int,
+) -> Tuple[Optional[str], int, str]:
+    """Validate one signal's fields: (skip reason or None, uic, normalized instrument)."""
+    action = sig.get("action")
+    direction = sig.get("direction")
+    instrument = sig.get("instrument")
+    uic = sig.get("uic")
+    asset_type = sig.get("asset_type")
+    signal_timestamp = sig.get("signal_timestamp")
+
+    if not (action and instrument and uic is not None and asset_type and signal_timestamp):
+        return "missing_required_fields", 0, ""
+    if action not in _ACTIONS:
+        return "unsupported_action", 0, ""
+    if asset_type != "FxSpot":
+        return "unsupported_asset_type", 0, ""
+    try:
+        uic = int(uic)
+    except Exception:
+        return "invalid_uic", 0, ""
+
+    norm_instrument = _instrument_key(str(instrument))
+    expected_uic = uic_map.get(norm_instrument)
+    if expected_uic is None:
+        return "instrument_not_allowed", 0, ""
+    if expected_uic != uic:
+        return "uic_mismatch", 0, ""
+
+    ts = _parse_timestamp(signal_timestamp)
+    if ts is None:
+        return "invalid_timestamp", 0, ""
+    if freshness_seconds > 0 and (now_utc - ts).total_seconds() > freshness_seconds:
+        return "stale_signal", 0, ""
+
+    if allowed_pairs and norm_instrument not in allowed_pairs:
+        return "pair_not_allowed", 0, ""
+
+    if action == "ENTRY" and (direction not in _SIDES or sig.get("lot_ratio") is None):
+        return "missing_direction_or_lot", 0, ""
+
+    return None, uic, norm_instrument
+
+
+def _prime_max_units(broker, keys, equity: float, max_units: int, cache: Dict[Tuple[int, str], int]) -> None:
+    """Run _find_max_units for each (uic, direction) in ``keys`` concurrently on _io_pool."""
+    futures = {key: _io_pool.submit(_find_max_units, broker, key[0], key[1], equity, max_units) for key in keys}
+    for key, future in futures.items():
+        try:
+            units = future.result()
+        except Exception:
+            continue
+        if units is not None:
+            cache[key] = units
+
+
+def _summarize(
+    skip_reasons: Dict[str, int],
+    log_skips: bool,
+    processed: int,
+    submitted: int,
+    failed: List[Tuple[str, Optional[str]]],
+    skipped: List[Tuple[str, str]],
+    dry_run: bool,
+    broker_name: str,
+) -> Dict[str, Any]:
+    if log_skips:
+        print(f"RESULT processed={processed} submitted={submitted} failed={len(failed)} skipped={len(skipped)}")
+        if not skip_reasons:
+            print("SKIP SUMMARY")
+            print("- none")
+    if skip_reasons:
+        print("SKIP SUMMARY")
+        for reason in sorted(skip_reasons):
+            print(f"- {reason}: {skip_reasons[reason]}")
+    return {
+        "processed": processed,
+        "submitted": submitted,
+        "failed": [{"segment_hash": h, "error": error} for h, error in failed],
+        "skipped": [{"segment_hash": h, "reason": reason} for h, reason in skipped],
+        "dry_run": dry_run,
+        "broker": broker_name,
+    }
+
+
+@_with_db
 def execute_pending_signals(
     broker_name: str,
     dry_run: bool = True,
@@ -146,27 +304,39 @@ def execute_pending_signals(
             else:
                 print(f"SKIP[{reason}]")
 
-    conn = connect_db(DB_PATH)
-    all_signals = get_all_trading_events(conn, limit=500)
-
+    conn = _get_conn()
     if process_last_n and process_last_n > 0:
-        signals = all_signals[:process_last_n]
+        signals = get_all_trading_events(conn, limit=min(process_last_n, 500))
     else:
-        latest_scrape = None
-        if all_signals:
-            latest_scrape = all_signals[0].get("scraped_at")
-        signals = [s for s in all_signals if s.get("scraped_at") == latest_scrape]
+        signals = get_latest_batch_events(conn)
 
     if log_skips:
         print(f"Signals loaded: {len(signals)} (process_last_n={process_last_n})")
 
-    broker_positions = {}
-    try:
-        broker_positions = broker.refresh_positions() if hasattr(broker, "refresh_positions") else {}
-    except Exception:
-        broker_positions = {}
+    # One IN lookup for the whole batch instead of was_executed/was_executed_recent per signal.
+    executed = executed_hashes(conn, broker.name, [s["segment_hash"] for s in signals])
+    date_key = datetime.now(timezone.utc).date().isoformat()
+    if all(s["segment_hash"] in executed for s in signals) and get_daily_equity(conn, date_key) is not None:
+        # Nothing new to act on and today's drawdown baseline is already captured, so the
+        # cycle ends before any broker round trip.
+        for sig in signals:
+            _note_skip("duplicate", sig)
+        return _summarize(skip_reasons, log_skips, 0, 0, [], [], dry_run, broker.name)
+
+    # Optional broker capabilities, resolved once per cycle rather than probed per call.
+    refresh_positions = getattr(broker, "refresh_positions", None)
+    get_equity = getattr(broker, "get_equity", None)
+    precheck = getattr(broker, "precheck_order", None)
 
-    equity = broker.get_equity() if hasattr(broker, "get_equity") else None
+    # Positions and equity are independent reads; overlap their round trips.
+    positions_future = _io_pool.submit(refresh_positions) if refresh_positions is not None else None
+    equity = get_equity() if get_equity is not None else None
+    broker_positions = {}
+    if positions_future is not None:
+        try:
+            broker_positions = positions_future.result()
+        except Exception:
+            broker_positions = {}
     if equity is None:
         _stop("Equity unavailable")
     try:
@@ -179,7 +349,6 @@ def execute_pending_signals(
         max_lot_cap = 1.0
     capped_equity = equity * max_lot_cap
 
-    date_key = datetime.now(timezone.utc).date().isoformat()
     baseline = get_daily_equity(conn, date_key)
     if baseline is None:
         set_daily_equity(conn, date_key, equity)
@@ -195,93 +364,212 @@ def execute_pending_signals(
 
     processed = 0
     submitted = 0
-    failed: List[Dict[str, Any]] = []
-    skipped: List[Dict[str, Any]] = []
-
+    # (segment_hash, reason/error) pairs; expanded to dicts only for the returned summary.
+    failed: List[Tuple[str, Optional[str]]] = []
+    skipped: List[Tuple[str, str]] = []
+    # Skips are written from ``skipped`` in one executemany; fills and failures commit as they happen.
 
     api_errors = 0
     order_rejections = 0
 
+    # Per-cycle view of baseline_units keyed by (instrument, direction), kept in step with writes.
+    baselines: Dict[Tuple[str, str], Optional[int]] = {}
+    # Equity is fixed for the cycle, so the precheck search only needs to run once per (uic, direction).
+    max_units_cache: Dict[Tuple[int, str], int] = {}
+    # Uics with a non-zero position, built once and kept current as this cycle's orders fill.
+    open_uics = {k for k, v in broker_positions.items() if v}
+    now_utc = datetime.now(timezone.utc)
+
+    # Field validation is pure CPU, so the whole batch is screened in one pass before any
+    # broker traffic; only the shortlist reaches the precheck/order stage below.
+    shortlist: List[Tuple[Dict[str, Any], int, str]] = []
     for sig in signals:
-        segment_hash = sig["segment_hash"]
-        signal_id = sig.get("signal_id") or segment_hash[:24]
-
-        if was_executed(conn, segment_hash, broker.name):
+        if sig["segment_hash"] in executed:
             _note_skip("duplicate", sig)
             continue
-        if was_executed_recent(conn, segment_hash, broker.name, window_seconds=600):
-            _note_skip("duplicate_recent", sig)
-            continue
-
-        action = sig.get("action")
-        direction = sig.get("direction")
-        instrument = sig.get("instrument")
-        uic = sig.get("uic")
-        asset_type = sig.get("asset_type")
-        signal_timestamp = sig.get("signal_timestamp")
-        lot_ratio = sig.get("lot_ratio")
-        is_add = bool(sig.get("is_add"))
-
-        if not (action and instrument and uic is not None and asset_type and signal_timestamp):
-            _note_skip("missing_required_fields", sig)
-            continue
-        if action not in ("ENTRY", "CLOSE_TP", "CLOSE_SL"):
-            _note_skip("unsupported_action", sig)
-            continue
-        if asset_type != "FxSpot":
-            _note_skip("unsupported_asset_type", sig)
-            continue
-        try:
-            uic = int(uic)
-        except Exception:
-            _note_skip("invalid_uic", sig)
-            continue
-
-        norm_instrument = str(instrument).upper().replace("/", "")
-        if norm_instrument not in resolved_uic_map:
-            _note_skip("instrument_not_allowed", sig)
-            continue
-        if resolved_uic_map[norm_instrument] != uic:
-            _note_skip("uic_mismatch", sig)
+        reason, uic, norm_instrument = _check_signal(sig, resolved_uic_map, allowed_pairs, now_utc, freshness_seconds)
+        if reason:
+            _note_skip(reason, sig)
             continue
+        shortlist.append((sig, uic, norm_instrument))
+
+    # Opening entries each need a precheck search; distinct (uic, direction) searches are
+    # independent Saxo round trips, so run them side by side before the loop. Only entries that
+    # clear the loop's position gates on the cycle-start snapshot are primed; the loop still
+    # searches (and memoises) anything not primed here.
+    search_keys = {
+        (uic, sig["direction"])
+        for sig, uic, _ in shortlist
+        if sig["action"] == "ENTRY"
+        and not sig.get("is_add")
+        and (uic in open_uics or len(open_uics) < 3)
+        and not _opposes(broker_positions.get(uic, 0), 1)
+    }
+    if len(search_keys) > 1:
+        _prime_max_units(broker, search_keys, capped_equity, max_total_units, max_units_cache)
 
-        ts = _parse_timestamp(signal_timestamp)
-        if ts is None:
-            _note_skip("invalid_timestamp", sig)
-            continue
-        if freshness_seconds > 0 and (datetime.now(timezone.utc) - ts).total_seconds() > freshness_seconds:
-            _note_skip("stale_signal", sig)
-            continue
+    # Skip decisions must outlive any error raised mid-loop (e.g. a broker HTTP failure);
+    # otherwise the next cycle would re-evaluate, and possibly trade, deliberately skipped signals.
+    try:
+        for sig, uic, norm_instrument in shortlist:
+            segment_hash = sig["segment_hash"]
+            signal_id = sig.get("signal_id") or segment_hash[:24]
+            action = sig["action"]
+            direction = sig.get("direction")
+            lot_ratio = sig.get("lot_ratio")
+            is_add = bool(sig.get("is_add"))
+
+            processed += 1
+
+            # Close signals
+            if action in _CLOSE_ACTIONS:
+                existing_units = broker_positions.get(uic) if uic in broker_positions else broker.get_open_position_units(uic)
+                if not existing_units:
+                    _note_skip("no_position", sig)
+                    skipped.append((segment_hash, "no position"))
+                    continue
+
+                close_side = "SELL" if existing_units > 0 else "BUY"
+                result: BrokerResult = broker.place_market_order(
+                    instrument=uic,
+                    side=close_side,
+                    units=abs(int(existing_units)),
+                    sl_price=None,
+                    tp_price=None,
+                    client_id=signal_id,
+                    dry_run=dry_run,
+                )
+                status = "filled" if result.ok else "failed"
+                record_execution(
+                    conn,
+                    segment_hash,
+                    broker.name,
+                    status,
+                    order_id=result.order_id,
+                    error_message=result.error,
+                    payload=orjson.dumps(result.payload).decode() if result.payload else None,
+                )
+                if result.ok:
+                    submitted += 1
+                    clear_baseline_units(conn, norm_instrument)
+                    open_uics.discard(uic)
+                    baselines.pop((norm_instrument, "BUY"), None)
+                    baselines.pop((norm_instrument, "SELL"), None)
+                    order_rejections = 0
+                else:
+                    failed.append((segment_hash, result.error))
+                    order_rejections += 1
+                    if order_rejections >= 3:
+                        _stop("3 consecutive order rejections")
+                continue
 
-        if allowed_pairs and norm_instrument not in allowed_pairs:
-            _note_skip("pair_not_allowed", sig)
-            continue
+            # ENTRY signals
+            # Position gates run before the baseline lookup so entries they reject cost no prechecks.
+            # Max simultaneous open positions = 3
+            if len(open_uics) >= 3 and uic not in open_uics:
+                _note_skip("max_open_positions", sig)
+                skipped.append((segment_hash, "max open positions"))
+                continue
 
-        if action == "ENTRY" and (direction not in ("BUY", "SELL") or lot_ratio is None):
-            _note_skip("missing_direction_or_lot", sig)
-            continue
+            # Conflict rule: do not open opposite positions. Entry units are positive (anything
+            # else is skipped as zero units below), so 1 stands in for them here.
+            existing_units = broker_positions.get(uic) if uic in broker_positions else broker.get_open_position_units(uic)
+            if _opposes(existing_units, 1):
+                _note_skip("conflict_position", sig)
+                skipped.append((segment_hash, "conflict position"))
+                continue
 
-        processed += 1
+            baseline_units = None
+            if is_add:
+                key = (norm_instrument, direction)
+                if key not in baselines:
+                    baselines[key] = get_baseline_units(conn, norm_instrument, direction)
+                baseline_units = baselines[key]
+                if baseline_units is None:
+                    _note_skip("missing_baseline", sig)
+                    skipped.append((segment_hash, "missing baseline"))
+                    continue
+            else:
+                baseline_units = max_units_cache.get((uic, direction))
+                if baseline_units is None:
+                    baseline_units = _find_max_units(broker, uic, direction, capped_equity, max_total_units)
+                    if baseline_units is not None:
+                        max_units_cache[(uic, direction)] = baseline_units
+                if baseline_units is None:
+                    _note_skip("baseline_unavailable", sig)
+                    skipped.append((segment_hash, "baseline unavailable"))
+                    continue
+                set_baseline_units(conn, norm_instrument, direction, baseline_units)
+                baselines[(norm_instrument, direction)] = baseline_units
+
+            # Round half up; anything that lands at or below zero is skipped just below.
+            units = int(baseline_units * float(lot_ratio) + 0.5)
+            if units <= 0:
+                _note_skip("zero_units", sig)
+                skipped.append((segment_hash, "zero units"))
+                continue
 
-        # Close signals
-        if action in ("CLOSE_TP", "CLOSE_SL"):
-            existing_units = broker_positions.get(uic) if uic in broker_positions else broker.get_open_position_units(uic)
-            if not existing_units:
-                _note_skip("no_position", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "no position"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="no position")
+            entry_price = sig.get("entry_price")
+            sl_price = sig.get("sl_price")
+            skip_risk_checks = False
+            if entry_price is None or sl_price is None:
+                if strict_mode or not allow_market_without_prices:
+                    _note_skip("missing_entry_sl", sig)
+                    skipped.append((segment_hash, "missing entry/sl"))
+                    continue
+                skip_risk_checks = True
+
+            if not skip_risk_checks:
+                try:
+                    risk_amount = abs(float(entry_price) - float(sl_price)) * abs(int(units))
+                except Exception:
+                    _note_skip("risk_calc_failed", sig)
+                    skipped.append((segment_hash, "risk calc failed"))
+                    continue
+
+                if equity <= 0:
+                    _stop("Invalid equity")
+                if risk_amount > (equity * 0.01):
+                    _note_skip("risk_limit", sig)
+                    skipped.append((segment_hash, "risk limit"))
+                    continue
+
+                try:
+                    notional = abs(float(entry_price)) * abs(int(units))
+                except Exception:
+                    _note_skip("exposure_calc_failed", sig)
+                    skipped.append((segment_hash, "exposure calc failed"))
+                    continue
+
+                if notional > (equity * 0.10):
+                    _note_skip("exposure_limit", sig)
+                    skipped.append((segment_hash, "exposure limit"))
+                    continue
+
+            margin_required = precheck(uic, direction, units) if precheck is not None else None
+            if margin_required is None:
+                api_errors += 1
+                if api_errors >= 3:
+                    _stop("3 consecutive Saxo API errors")
+                _note_skip("margin_unavailable", sig)
+                skipped.append((segment_hash, "margin unavailable"))
+                continue
+            api_errors = 0
+            if margin_required > (equity * 0.03):
+                _note_skip("margin_limit", sig)
+                skipped.append((segment_hash, "margin limit"))
                 continue
 
-            close_side = "SELL" if existing_units > 0 else "BUY"
             result: BrokerResult = broker.place_market_order(
                 instrument=uic,
-                side=close_side,
-                units=abs(int(existing_units)),
-                sl_price=None,
-                tp_price=None,
+                side=direction,
+                units=units,
+                sl_price=sig.get("sl_price"),
+                tp_price=sig.get("tp_price"),
                 client_id=signal_id,
                 dry_run=dry_run,
             )
+
             status = "filled" if result.ok else "failed"
             record_execution(
                 conn,
@@ -290,169 +578,23 @@ def execute_pending_signals(
                 status,
                 order_id=result.order_id,
                 error_message=result.error,
-                payload=json.dumps(result.payload) if result.payload else None,
+                payload=orjson.dumps(result.payload).decode() if result.payload else None,
             )
+
             if result.ok:
                 submitted += 1
-                clear_baseline_units(conn, norm_instrument)
+                open_uics.add(uic)
                 order_rejections = 0
             else:
-                failed.append({"segment_hash": segment_hash, "error": result.error})
+                failed.append((segment_hash, result.error))
                 order_rejections += 1
                 if order_rejections >= 3:
                     _stop("3 consecutive order rejections")
-            continue
-
-        # ENTRY signals
-        baseline_units = None
-        if is_add:
-            baseline_units = get_baseline_units(conn, norm_instrument, direction)
-            if baseline_units is None:
-                _note_skip("missing_baseline", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "missing baseline"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="missing baseline")
-                continue
-        else:
-            baseline_units = _find_max_units(broker, uic, direction, capped_equity, max_total_units)
-            if baseline_units is None:
-                _note_skip("baseline_unavailable", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "baseline unavailable"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="baseline unavailable")
-                continue
-            set_baseline_units(conn, norm_instrument, direction, baseline_units)
-
-        units = int(round(baseline_units * float(lot_ratio)))
-        if units <= 0:
-            _note_skip("zero_units", sig)
-            skipped.append({"segment_hash": segment_hash, "reason": "zero units"})
-            record_execution(conn, segment_hash, broker.name, "skipped", error_message="zero units")
-            continue
-
-        # Max simultaneous open positions = 3
-        distinct_open = [k for k, v in broker_positions.items() if v]
-        if len(distinct_open) >= 3 and uic not in distinct_open:
-            _note_skip("max_open_positions", sig)
-            skipped.append({"segment_hash": segment_hash, "reason": "max open positions"})
-            record_execution(conn, segment_hash, broker.name, "skipped", error_message="max open positions")
-            continue
-
-        # Conflict rule: do not open opposite positions
-        existing_units = broker_positions.get(uic) if uic in broker_positions else broker.get_open_position_units(uic)
-        conflict = existing_units and (existing_units > 0 > units or existing_units < 0 < units)
-        if conflict:
-            _note_skip("conflict_position", sig)
-            skipped.append({"segment_hash": segment_hash, "reason": "conflict position"})
-            record_execution(conn, segment_hash, broker.name, "skipped", error_message="conflict position")
-            continue
-
-        entry_price = sig.get("entry_price")
-        sl_price = sig.get("sl_price")
-        skip_risk_checks = False
-        if entry_price is None or sl_price is None:
-            if strict_mode or not allow_market_without_prices:
-                _note_skip("missing_entry_sl", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "missing entry/sl"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="missing entry/sl")
-                continue
-            skip_risk_checks = True
-
-        if not skip_risk_checks:
-            try:
-                risk_amount = abs(float(entry_price) - float(sl_price)) * abs(int(units))
-            except Exception:
-                _note_skip("risk_calc_failed", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "risk calc failed"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="risk calc failed")
-                continue
-
-            if equity <= 0:
-                _stop("Invalid equity")
-            if risk_amount > (equity * 0.01):
-                _note_skip("risk_limit", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "risk limit"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="risk limit")
-                continue
+    finally:
+        record_skipped_executions(conn, broker.name, skipped, commit=False)
+    conn.commit()
 
-            try:
-                notional = abs(float(entry_price)) * abs(int(units))
-            except Exception:
-                _note_skip("exposure_calc_failed", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "exposure calc failed"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="exposure calc failed")
-                continue
-
-            if notional > (equity * 0.10):
-                _note_skip("exposure_limit", sig)
-                skipped.append({"segment_hash": segment_hash, "reason": "exposure limit"})
-                record_execution(conn, segment_hash, broker.name, "skipped", error_message="exposure limit")
-                continue
-
-        margin_required = broker.precheck_order(uic, direction, units) if hasattr(broker, "precheck_order") else None
-        if margin_required is None:
-            api_errors += 1
-            if api_errors >= 3:
-                _stop("3 consecutive Saxo API errors")
-            _note_skip("margin_unavailable", sig)
-            skipped.append({"segment_hash": segment_hash, "reason": "margin unavailable"})
-            record_execution(conn, segment_hash, broker.name, "skipped", error_message="margin unavailable")
-            continue
-        api_errors = 0
-        if margin_required > (equity * 0.03):
-            _note_skip("margin_limit", sig)
-            skipped.append({"segment_hash": segment_hash, "reason": "margin limit"})
-            record_execution(conn, segment_hash, broker.name, "skipped", error_message="margin limit")
-            continue
-
-        result: BrokerResult = broker.place_market_order(
-            instrument=uic,
-            side=direction,
-            units=units,
-            sl_price=sig.get("sl_price"),
-            tp_price=sig.get("tp_price"),
-            client_id=signal_id,
-            dry_run=dry_run,
-        )
-
-        status = "filled" if result.ok else "failed"
-        record_execution(
-            conn,
-            segment_hash,
-            broker.name,
-            status,
-            order_id=result.order_id,
-            error_message=result.error,
-            payload=json.dumps(result.payload) if result.payload else None,
-        )
-
-        if result.ok:
-            submitted += 1
-            order_rejections = 0
-        else:
-            failed.append({"segment_hash": segment_hash, "error": result.error})
-            order_rejections += 1
-            if order_rejections >= 3:
-                _stop("3 consecutive order rejections")
-
-
-
-    if log_skips:
-        print(f"RESULT processed={processed} submitted={submitted} failed={len(failed)} skipped={len(skipped)}")
-        if not skip_reasons:
-            print("SKIP SUMMARY")
-            print("- none")
-    if skip_reasons:
-        print("SKIP SUMMARY")
-        for reason in sorted(skip_reasons):
-            print(f"- {reason}: {skip_reasons[reason]}")
-    conn.close()
-    return {
-        "processed": processed,
-        "submitted": submitted,
-        "failed": failed,
-        "skipped": skipped,
-        "dry_run": dry_run,
-        "broker": broker.name,
-    }
+    return _summarize(skip_reasons, log_skips, processed, submitted, failed, skipped, dry_run, broker.name)
 
 
 def run_execution_cycle() -> Dict[str, Any]:
@@ -471,23 +613,47 @@ def run_execution_cycle() -> Dict[str, Any]:
     )
 
 
+@_with_db
+def _latest_event_id() -> Optional[int]:
+    return get_latest_trading_event_id(_get_conn())
+
+
+# (newest trading event id, UTC date) of the last cycle run_cycle_if_new completed. The date
+# forces one cycle per day so the daily drawdown baseline is still captured on quiet days.
+_last_cycle_marker: Optional[Tuple[Optional[int], Any]] = None
+
+
+def run_cycle_if_new() -> Optional[Dict[str, Any]]:
+    """
+    run_execution_cycle, unless no trading event has been stored since the last completed
+    call (returns None then, without touching the broker). A cycle that raises is retried.
+    """
+    global _last_cycle_marker
+    marker = (_latest_event_id(), datetime.now(timezone.utc).date())
+    if marker == _last_cycle_marker:
+        return None
+    result = run_execution_cycle()
+    _last_cycle_marker = marker
+    return result
+
+
 def run_loop(poll_interval: int = runtime_config.DEFAULT_SETTINGS["poll_interval"]) -> None:
     poll_interval = max(5, int(poll_interval))
+    # Fixed-rate schedule: cycle time is absorbed into the wait instead of added to it.
+    next_wake = time.monotonic()
     while True:
+        next_wake += poll_interval
         try:
-            run_execution_cycle()
+            run_cycle_if_new()
         except SystemExit:
             raise
         except Exception:
             pass
-        time.sleep(poll_interval)
-
-
-def list_recent_orders(limit: int = 100) -> List[Dict[str, Any]]:
-    conn = connect_db(DB_PATH)
-    rows = list_executions(conn, limit=limit)
-    conn.close()
-    return rows
+        now = time.monotonic()
+        if now > next_wake + poll_interval:
+            # Overran by more than a period; resync rather than firing back-to-back cycles.
+            next_wake = now + poll_interval
+        time.sleep(max(0.0, next_wake - now))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,4 @@
 import logging
-import os
 from dotenv import load_dotenv
 
 from src.config.setting import load_saxo_settings
@@ -29,11 +28,7 @@ def main() -> None:
 
     try:
         oauth.authenticate(code)
-        print("[+] OAuth authentication successful")
-        if oauth.token:
-            print(f"Access token: {oauth.token.access_token}")
-            if oauth.token.refresh_token:
-                print(f"Refresh token: {oauth.token.refresh_token}")
+        logger.info("OAuth authentication successful")
     except Exception as exc:
         print("[-] OAuth failed:", exc)
         return
@@ -1,3 +1,5 @@
+import json
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
@@ -28,17 +30,29 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 }
 
 
-def load_settings() -> Dict[str, Any]:
-    if SETTINGS_PATH.exists():
-        import json
+# Parsed settings keyed on file mtime; callers get shallow copies so the cached dict is never mutated.
+_cache: Dict[str, Any] = {"mtime": None, "data": None}
+_lock = threading.Lock()
+
 
-        return json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
-    return DEFAULT_SETTINGS.copy()
+def load_settings() -> Dict[str, Any]:
+    try:
+        mtime = SETTINGS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return DEFAULT_SETTINGS.copy()
+    with _lock:
+        if _cache["data"] is None or _cache["mtime"] != mtime:
+            _cache["data"] = json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
+            _cache["mtime"] = mtime
+        return _cache["data"].copy()
 
 
 def save_settings(data: Dict[str, Any]) -> Dict[str, Any]:
     settings = load_settings()
     settings.update(data)
     SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SETTINGS_PATH.write_text(__import__("json").dumps(settings, ensure_ascii=False, indent=2), encoding="utf-8")
+    with _lock:
+        SETTINGS_PATH.write_text(json.dumps(settings, ensure_ascii=False, indent=2), encoding="utf-8")
+        _cache["data"] = settings.copy()
+        _cache["mtime"] = SETTINGS_PATH.stat().st_mtime_ns
     return settings
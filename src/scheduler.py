@@ -1,10 +1,10 @@
-import threading
-import time
+import asyncio
+import os
 from datetime import datetime, timezone
 from typing import Optional
 
 from src import runtime_config
-from .executor import run_execution_cycle
+from .executor import run_cycle_if_new
 from .storage import connect_db, get_latest_snapshot, DB_PATH
 
 # Lightweight heartbeat for the API
@@ -35,42 +35,52 @@ def get_scrape_health() -> dict:
     }
 
 
-def run_scheduler(stop_event: threading.Event) -> None:
-    """
-    Background loop: when settings.running is True, run scraper once then execute trades.
-    """
+def _run_cycle(settings: dict) -> None:
+    """One blocking scrape + execute pass; runs in a worker thread."""
     global _last_attempt, _last_success, _last_error
 
-    while not stop_event.is_set():
-        settings = runtime_config.load_settings()
-        if settings.get("running", False):
-            import os
+    os.environ["HEADLESS"] = "true" if settings.get("headless_scrape", True) else "false"
+    _last_attempt = _utcnow()
 
-            os.environ["HEADLESS"] = "true" if settings.get("headless_scrape", True) else "false"
-            _last_attempt = _utcnow()
+    try:
+        conn = connect_db(DB_PATH)
+        before = get_latest_snapshot(conn)
+        res = _scrape_once_safe()
+        after = get_latest_snapshot(conn)
+        conn.close()
+
+        if isinstance(res, dict) and res.get("error"):
+            _last_error = res["error"]
+        elif after and (not before or after.get("id") != before.get("id")):
+            _last_success = after.get("scraped_at") or _utcnow()
+            _last_error = None
+        else:
+            # Scrape ran but no new data inserted
+            _last_error = None
+    except Exception as exc:
+        _last_error = str(exc)
 
-            try:
-                conn = connect_db(DB_PATH)
-                before = get_latest_snapshot(conn)
-                res = _scrape_once_safe()
-                after = get_latest_snapshot(conn)
-                conn.close()
-
-                if isinstance(res, dict) and res.get("error"):
-                    _last_error = res["error"]
-                elif after and (not before or after.get("id") != before.get("id")):
-                    _last_success = after.get("scraped_at") or _utcnow()
-                    _last_error = None
-                else:
-                    # Scrape ran but no new data inserted
-                    _last_error = None
-            except Exception as exc:
-                _last_error = str(exc)
+    try:
+        # Quiet polls (no new trading event since the last cycle) skip the broker round trips.
+        run_cycle_if_new()
+    except Exception as exc:
+        # keep loop alive; surface last error
+        _last_error = _last_error or str(exc)
 
+
+async def run_scheduler() -> None:
+    """
+    Background task: when settings.running is True, run scraper once then execute trades.
+    Cancel the task to stop it.
+    """
+    while True:
+        settings = runtime_config.load_settings()
+        if settings.get("running", False):
+            # Selenium and broker I/O block, so the pass itself runs off the event loop.
             try:
-                run_execution_cycle()
-            except Exception as exc:
-                # keep loop alive; surface last error
-                _last_error = _last_error or str(exc)
+                await asyncio.to_thread(_run_cycle, settings)
+            except SystemExit:
+                # Executor safety stop: end the task instead of letting it reach the event loop.
+                return
         poll = max(5, int(settings.get("poll_interval", runtime_config.DEFAULT_SETTINGS["poll_interval"])))
-        stop_event.wait(poll)
+        await asyncio.sleep(poll)
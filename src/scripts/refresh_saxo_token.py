@@ -1,39 +1,10 @@
 import os
-from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
 
 from src.config.setting import SaxoSettings
-
-
-ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
-
-
-def _update_env(values: dict) -> None:
-    if ENV_PATH.exists():
-        lines = ENV_PATH.read_text(encoding="utf-8").splitlines()
-    else:
-        lines = []
-
-    keys = set(values.keys())
-    updated = []
-    seen = set()
-    for line in lines:
-        if not line or line.strip().startswith("#") or "=" not in line:
-            updated.append(line)
-            continue
-        k, _ = line.split("=", 1)
-        k = k.strip()
-        if k in values:
-            updated.append(f"{k}={values[k]}")
-            seen.add(k)
-        else:
-            updated.append(line)
-    for k in keys - seen:
-        updated.append(f"{k}={values[k]}")
-
-    ENV_PATH.write_text("\n".join(updated) + "\n", encoding="utf-8")
+from src.env_file import update_env_vars
 
 
 def main() -> None:
@@ -74,7 +45,7 @@ def main() -> None:
     if refresh_expires:
         updates["SAXO_REFRESH_TOKEN_TTL"] = str(refresh_expires)
 
-    _update_env(updates)
+    update_env_vars(updates)
     print("Token refreshed and .env updated")
 
 
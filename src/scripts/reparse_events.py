@@ -25,34 +25,14 @@ def main() -> None:
     cur.execute("SELECT * FROM parsed_events WHERE is_trading = 1 ORDER BY id DESC")
     rows = [dict(r) for r in cur.fetchall()]
 
-    updated = 0
+    updates = []
     skipped = 0
     for row in rows:
         parsed = classify_and_parse(row["segment_text"], row["scraped_at"], uic_map)
         if not parsed.get("is_trading"):
             skipped += 1
             continue
-        cur.execute(
-            """
-            UPDATE parsed_events
-            SET
-                pair = ?,
-                action = ?,
-                side = ?,
-                lot_ratio = ?,
-                is_add = ?,
-                entry_price = ?,
-                sl_price = ?,
-                tp_price = ?,
-                signal_id = ?,
-                direction = ?,
-                instrument = ?,
-                uic = ?,
-                asset_type = ?,
-                signal_timestamp = ?,
-                segment_text = ?
-            WHERE id = ?
-            """,
+        updates.append(
             (
                 parsed.get("pair"),
                 parsed.get("action"),
@@ -70,9 +50,33 @@ def main() -> None:
                 parsed.get("signal_timestamp"),
                 parsed.get("segment_text"),
                 row["id"],
-            ),
+            )
         )
-        updated += 1
+
+    cur.executemany(
+        """
+        UPDATE parsed_events
+        SET
+            pair = ?,
+            action = ?,
+            side = ?,
+            lot_ratio = ?,
+            is_add = ?,
+            entry_price = ?,
+            sl_price = ?,
+            tp_price = ?,
+            signal_id = ?,
+            direction = ?,
+            instrument = ?,
+            uic = ?,
+            asset_type = ?,
+            signal_timestamp = ?,
+            segment_text = ?
+        WHERE id = ?
+        """,
+        updates,
+    )
+    updated = len(updates)
 
     conn.commit()
     conn.close()
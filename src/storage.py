@@ -1,8 +1,10 @@
 import hashlib
+import queue
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "fincs.db"
@@ -18,18 +20,57 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def connect_db(db_path: str | Path = DB_PATH) -> sqlite3.Connection:
+# Applied once per connection; long-lived connections keep these for their lifetime.
+_CONNECTION_PRAGMAS = (
+    # page_size only takes effect when the file is first created, so it must precede WAL.
+    "PRAGMA page_size=8192;",
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-64000;",
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA mmap_size=268435456;",
+)
+
+
+def connect_db(db_path: str | Path = DB_PATH, read_only: bool = False) -> sqlite3.Connection:
     """Open SQLite connection and ensure schema exists."""
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path, timeout=2, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA busy_timeout=2000;")
+    # Statements are cached per connection keyed by SQL text, so long-lived pooled
+    # connections skip re-preparing the hot SELECTs; size it above the helper count.
+    conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False, cached_statements=256)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     conn.row_factory = sqlite3.Row
     _ensure_schema(conn)
+    if read_only:
+        conn.execute("PRAGMA query_only=ON;")
     return conn
 
 
+class ConnectionPool:
+    """Fixed set of tuned SQLite connections shared across API requests."""
+
+    def __init__(self, db_path: str | Path = DB_PATH, size: int = 4, read_only: bool = True) -> None:
+        self._queue: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._conns = [connect_db(db_path, read_only=read_only) for _ in range(max(1, size))]
+        for conn in self._conns:
+            self._queue.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._queue.get()
+        try:
+            yield conn
+        finally:
+            self._queue.put(conn)
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.close()
+
+
 def _ensure_schema(conn: sqlite3.Connection) -> None:
     """Create tables and backfill new columns when upgrading."""
     cur = conn.cursor()
@@ -284,12 +325,32 @@ def insert_parsed_event(
     return True
 
 
-def _rows_to_dicts(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
-    return [dict(r) for r in rows]
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor that yields plain tuples, bypassing the connection's sqlite3.Row factory."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def _rows_to_dicts(cur: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    # Column names are resolved once per result set instead of once per row.
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+def _iter_dicts(cur: sqlite3.Cursor) -> Iterator[Dict[str, Any]]:
+    cols = [d[0] for d in cur.description]
+    for r in cur:
+        yield dict(zip(cols, r))
 
 
 def get_all_trading_events(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
-    cur = conn.cursor()
+    return list(iter_trading_events(conn, limit=limit))
+
+
+def iter_trading_events(conn: sqlite3.Connection, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Like get_all_trading_events, but yields rows as the cursor produces them."""
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM parsed_events
@@ -299,11 +360,40 @@ def get_all_trading_events(conn: sqlite3.Connection, limit: int = 100) -> List[D
         """,
         (limit,),
     )
-    return _rows_to_dicts(cur.fetchall())
+    yield from _iter_dicts(cur)
 
 
-def get_events_by_pair(conn: sqlite3.Connection, pair: str, limit: int = 100) -> List[Dict[str, Any]]:
+def get_latest_batch_events(conn: sqlite3.Connection, window: int = 500) -> List[Dict[str, Any]]:
+    """
+    Trading events sharing the scraped_at of the newest row by id, among the newest ``window``
+    trading rows. Rows backfilled or re-parsed with older timestamps still define the batch.
+    """
+    cur = _tuple_cursor(conn)
+    cur.execute(
+        """
+        SELECT * FROM (
+            SELECT * FROM parsed_events WHERE is_trading = 1 ORDER BY id DESC LIMIT ?
+        )
+        WHERE scraped_at = (
+            SELECT scraped_at FROM parsed_events WHERE is_trading = 1 ORDER BY id DESC LIMIT 1
+        )
+        ORDER BY id DESC
+        """,
+        (window,),
+    )
+    return _rows_to_dicts(cur)
+
+
+def get_latest_trading_event_id(conn: sqlite3.Connection) -> Optional[int]:
+    """id of the newest trading event, or None when there are none."""
     cur = conn.cursor()
+    cur.execute("SELECT MAX(id) FROM parsed_events WHERE is_trading = 1")
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def get_events_by_pair(conn: sqlite3.Connection, pair: str, limit: int = 100) -> List[Dict[str, Any]]:
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM parsed_events
@@ -313,7 +403,7 @@ def get_events_by_pair(conn: sqlite3.Connection, pair: str, limit: int = 100) ->
         """,
         (pair, limit),
     )
-    return _rows_to_dicts(cur.fetchall())
+    return _rows_to_dicts(cur)
 
 
 def get_latest_trading_event(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
@@ -343,8 +433,41 @@ def get_latest_snapshot(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
     return dict(row) if row else None
 
 
-def get_recent_raw(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
+def get_status_bundle(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Latest scrape time and latest trading segment for /status in one statement."""
     cur = conn.cursor()
+    cur.execute(
+        """
+        WITH snap AS (
+            SELECT scraped_at FROM raw_snapshots
+            ORDER BY datetime(scraped_at) DESC
+            LIMIT 1
+        ),
+        evt AS (
+            SELECT scraped_at, segment_text FROM parsed_events
+            WHERE is_trading = 1
+            ORDER BY id DESC
+            LIMIT 1
+        )
+        SELECT
+            snap.scraped_at AS last_scrape,
+            evt.scraped_at AS last_new_segment,
+            evt.segment_text AS latest_signal
+        FROM (SELECT 1)
+        LEFT JOIN snap ON 1
+        LEFT JOIN evt ON 1
+        """
+    )
+    return dict(cur.fetchone())
+
+
+def get_recent_raw(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
+    return list(iter_recent_raw(conn, limit=limit))
+
+
+def iter_recent_raw(conn: sqlite3.Connection, limit: int = 100) -> Iterator[Dict[str, Any]]:
+    """Like get_recent_raw, but yields rows as the cursor produces them."""
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM raw_snapshots
@@ -353,7 +476,7 @@ def get_recent_raw(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str,
         """,
         (limit,),
     )
-    return _rows_to_dicts(cur.fetchall())
+    yield from _iter_dicts(cur)
 
 
 def get_event_statistics(conn: sqlite3.Connection) -> Dict[str, Any]:
@@ -398,7 +521,9 @@ def record_execution(
     order_id: Optional[str] = None,
     error_message: Optional[str] = None,
     payload: Optional[str] = None,
+    commit: bool = True,
 ) -> None:
+    """Upsert an executed_orders row; pass ``commit=False`` to leave it in the open transaction."""
     cur = conn.cursor()
     cur.execute(
         """
@@ -408,7 +533,28 @@ def record_execution(
         """,
         (segment_hash, broker, status, order_id, error_message, payload, utcnow()),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+
+
+def record_skipped_executions(
+    conn: sqlite3.Connection,
+    broker: str,
+    rows: Iterable[Tuple[str, str]],
+    commit: bool = True,
+) -> None:
+    """Upsert many ``(segment_hash, reason)`` skips with one prepared INSERT."""
+    now = utcnow()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO executed_orders
+        (segment_hash, broker, status, order_id, error_message, payload, created_at)
+        VALUES (?, ?, 'skipped', NULL, ?, NULL, ?)
+        """,
+        ((segment_hash, broker, reason, now) for segment_hash, reason in rows),
+    )
+    if commit:
+        conn.commit()
 
 
 def was_executed(conn: sqlite3.Connection, segment_hash: str, broker: str) -> bool:
@@ -420,8 +566,26 @@ def was_executed(conn: sqlite3.Connection, segment_hash: str, broker: str) -> bo
     return cur.fetchone() is not None
 
 
-def list_executions(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
+# Stays under SQLITE_MAX_VARIABLE_NUMBER on older builds (999) with room for the broker param.
+_IN_CHUNK = 500
+
+
+def executed_hashes(conn: sqlite3.Connection, broker: str, hashes: List[str]) -> Set[str]:
+    """Subset of ``hashes`` already recorded for ``broker``, via chunked IN lookups on the unique index."""
+    found: Set[str] = set()
     cur = conn.cursor()
+    for start in range(0, len(hashes), _IN_CHUNK):
+        chunk = hashes[start:start + _IN_CHUNK]
+        cur.execute(
+            f"SELECT segment_hash FROM executed_orders WHERE broker = ? AND segment_hash IN ({','.join('?' * len(chunk))})",
+            (broker, *chunk),
+        )
+        found.update(row[0] for row in cur)
+    return found
+
+
+def list_executions(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM executed_orders
@@ -430,7 +594,7 @@ def list_executions(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str
         """,
         (limit,),
     )
-    return _rows_to_dicts(cur.fetchall())
+    return _rows_to_dicts(cur)
 
 
 # --- Trade audit helpers ----------------------------------------------------
@@ -488,7 +652,7 @@ def record_trade_audit(
 
 
 def list_trade_audits(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[str, Any]]:
-    cur = conn.cursor()
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM trade_audits
@@ -497,7 +661,7 @@ def list_trade_audits(conn: sqlite3.Connection, limit: int = 100) -> List[Dict[s
         """,
         (limit,),
     )
-    return _rows_to_dicts(cur.fetchall())
+    return _rows_to_dicts(cur)
 
 
 # --- Baseline sizing helpers ------------------------------------------------
@@ -594,7 +758,7 @@ def set_daily_equity(conn: sqlite3.Connection, date_key: str, equity: float) ->
 
 
 def get_recent_executions(conn: sqlite3.Connection, broker: str, limit: int = 3) -> List[Dict[str, Any]]:
-    cur = conn.cursor()
+    cur = _tuple_cursor(conn)
     cur.execute(
         """
         SELECT * FROM executed_orders
@@ -605,7 +769,7 @@ def get_recent_executions(conn: sqlite3.Connection, broker: str, limit: int = 3)
         ,
         (broker, limit),
     )
-    return _rows_to_dicts(cur.fetchall())
+    return _rows_to_dicts(cur)
 
 
 # --- Recent execution guard -------------------------------------------------
@@ -91,18 +91,11 @@ def _build_order_payload(signal: TradingSignal) -> Dict[str, Any]:
 
 
 def _extract_mid_spread(payload: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
-    # Handles common shapes from /trade/v1/prices.
-    if "Prices" in payload and payload["Prices"]:
-        return _mid_spread_from_price(payload["Prices"][0])
-
-    if "PriceInfos" in payload and payload["PriceInfos"]:
-        price_info = payload["PriceInfos"][0].get("PriceInfo") or payload["PriceInfos"][0]
-        return _mid_spread_from_price(price_info)
-
-    if "PriceInfo" in payload:
-        return _mid_spread_from_price(payload["PriceInfo"])
-
-    return None, None
+    # BaseBroker.get_price entries carry Bid/Ask under "Quote".
+    quote = payload.get("Quote")
+    if not quote:
+        return None, None
+    return _mid_spread_from_price(quote)
 
 
 def _mid_spread_from_price(price_info: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import broker, env_file
+
+
+def _write_env(path: Path, access: str, refresh: str, mtime_ns: int) -> None:
+    expires_at = int(time.time()) + 3600
+    path.write_text(
+        f"SAXO_ACCESS_TOKEN={access}\nSAXO_REFRESH_TOKEN={refresh}\nSAXO_TOKEN_EXPIRES_AT={expires_at}\n",
+        encoding="utf-8",
+    )
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class GetBrokerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.env_path = Path(self.tmp.name) / ".env"
+        patches = [
+            mock.patch.object(env_file, "ENV_PATH", self.env_path),
+            mock.patch.dict(env_file._env_cache, {"mtime": 0, "data": {}, "text": ""}),
+            mock.patch.dict(
+                os.environ,
+                {
+                    "SAXO_CLIENT_ID": "id",
+                    "SAXO_CLIENT_SECRET": "secret",
+                    "SAXO_REDIRECT_URI": "http://localhost/callback",
+                    "SAXO_ENV": "sim",
+                },
+            ),
+            mock.patch.object(broker.runtime_config, "load_settings", lambda: {}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        broker._saxo_broker.cache_clear()
+        self.addCleanup(broker._saxo_broker.cache_clear)
+
+    def test_token_rotation_keeps_the_broker_instance(self) -> None:
+        _write_env(self.env_path, "access-1", "refresh-1", 1_000_000_000)
+        first = broker.get_broker("saxo")
+        self.assertEqual(first.oauth.token.access_token, "access-1")
+
+        # Another process rotated the token and persisted it to .env.
+        _write_env(self.env_path, "access-2", "refresh-2", 2_000_000_000)
+        second = broker.get_broker("saxo")
+
+        self.assertIs(second, first)
+        self.assertEqual(second.oauth.token.access_token, "access-2")
+        self.assertEqual(second.oauth.token.refresh_token, "refresh-2")
+
+
+if __name__ == "__main__":
+    unittest.main()
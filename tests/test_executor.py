@@ -0,0 +1,192 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import executor
+from src.storage import connect_db, insert_parsed_event, list_executions, utcnow
+
+
+class _FailingBroker:
+    """Holds a USDJPY position, none on EURUSD, and fails every order with a network error."""
+
+    name = "saxo"
+
+    def refresh_positions(self):
+        return {22: 1000}
+
+    def get_equity(self):
+        return 10000.0
+
+    def get_open_position_units(self, uic):
+        return 0
+
+    def place_market_order(self, **kwargs):
+        raise ConnectionError("broker unreachable")
+
+
+class _PrecheckCountingBroker:
+    """Holds a short USDJPY position and records every precheck it is asked for."""
+
+    name = "saxo"
+
+    def __init__(self):
+        self.prechecked_uics = []
+
+    def refresh_positions(self):
+        return {22: -1000}
+
+    def get_equity(self):
+        return 10000.0
+
+    def get_open_position_units(self, uic):
+        return 0
+
+    def precheck_order(self, uic, direction, units):
+        self.prechecked_uics.append(uic)
+        return 1.0
+
+
+def _entry_signal(conn, segment_hash: str, instrument: str, uic: int, scraped_at: str) -> None:
+    insert_parsed_event(
+        conn,
+        scraped_at=scraped_at,
+        segment_hash=segment_hash,
+        segment_text="",
+        is_trading=True,
+        pair=instrument,
+        action="ENTRY",
+        side="BUY",
+        lot_ratio=0.5,
+        is_add=False,
+        entry_price=None,
+        sl_price=None,
+        tp_price=None,
+        signal_id=None,
+        direction="BUY",
+        instrument=instrument,
+        uic=uic,
+        asset_type="FxSpot",
+        signal_timestamp=scraped_at,
+    )
+
+
+def _close_signal(conn, segment_hash: str, instrument: str, uic: int, scraped_at: str) -> None:
+    insert_parsed_event(
+        conn,
+        scraped_at=scraped_at,
+        segment_hash=segment_hash,
+        segment_text="",
+        is_trading=True,
+        pair=instrument,
+        action="CLOSE_TP",
+        side=None,
+        lot_ratio=None,
+        is_add=False,
+        entry_price=None,
+        sl_price=None,
+        tp_price=None,
+        signal_id=None,
+        direction=None,
+        instrument=instrument,
+        uic=uic,
+        asset_type="FxSpot",
+        signal_timestamp=scraped_at,
+    )
+
+
+class ExecutePendingSignalsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "fincs.db"
+        patches = [
+            mock.patch.object(executor, "DB_PATH", self.db_path),
+            mock.patch.object(executor, "_conn", None),
+            mock.patch.object(executor, "get_broker", lambda name: _FailingBroker()),
+            mock.patch.dict(os.environ, {"SAXO_ENV": "sim", "BOT_ENABLED": "true"}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        if executor._conn is not None:
+            executor._conn.close()
+        self.tmp.cleanup()
+
+    def test_skips_are_persisted_when_a_later_order_raises(self) -> None:
+        conn = connect_db(self.db_path)
+        scraped_at = utcnow()
+        # Newest id is processed first: the EURUSD close is skipped, then the USDJPY order raises.
+        _close_signal(conn, "close-usdjpy", "USDJPY", 22, scraped_at)
+        _close_signal(conn, "close-eurusd", "EURUSD", 21, scraped_at)
+        conn.close()
+
+        with self.assertRaises(ConnectionError):
+            executor.execute_pending_signals("saxo", dry_run=True, uic_map={"EURUSD": 21, "USDJPY": 22})
+
+        conn = connect_db(self.db_path)
+        rows = list_executions(conn)
+        conn.close()
+        self.assertEqual(
+            [(r["segment_hash"], r["status"], r["error_message"]) for r in rows],
+            [("close-eurusd", "skipped", "no position")],
+        )
+
+    def test_entries_rejected_by_position_gates_cost_no_prechecks(self) -> None:
+        conn = connect_db(self.db_path)
+        scraped_at = utcnow()
+        _entry_signal(conn, "entry-usdjpy", "USDJPY", 22, scraped_at)
+        _entry_signal(conn, "entry-eurusd", "EURUSD", 21, scraped_at)
+        conn.close()
+
+        broker = _PrecheckCountingBroker()
+        with mock.patch.object(executor, "get_broker", lambda name: broker):
+            executor.execute_pending_signals("saxo", dry_run=True, uic_map={"EURUSD": 21, "USDJPY": 22})
+
+        self.assertTrue(broker.prechecked_uics)
+        self.assertEqual(set(broker.prechecked_uics), {21})
+        conn = connect_db(self.db_path)
+        rows = list_executions(conn)
+        conn.close()
+        self.assertEqual(
+            sorted((r["segment_hash"], r["error_message"]) for r in rows),
+            [("entry-eurusd", "missing entry/sl"), ("entry-usdjpy", "conflict position")],
+        )
+
+
+    def test_cycle_runs_only_when_a_trading_event_lands(self) -> None:
+        calls = []
+        with mock.patch.object(executor, "_last_cycle_marker", None), mock.patch.object(
+            executor, "run_execution_cycle", lambda: calls.append(1) or {}
+        ):
+            executor.run_cycle_if_new()
+            executor.run_cycle_if_new()
+            self.assertEqual(len(calls), 1)
+
+            conn = connect_db(self.db_path)
+            _close_signal(conn, "close-usdjpy", "USDJPY", 22, utcnow())
+            conn.close()
+            executor.run_cycle_if_new()
+            executor.run_cycle_if_new()
+            self.assertEqual(len(calls), 2)
+
+
+class ConflictRuleTest(unittest.TestCase):
+    def test_only_opposite_signs_conflict(self) -> None:
+        cases = [
+            (1000, -500, True),
+            (-1000, 500, True),
+            (0, 500, False),
+            (0, -500, False),
+            (1000, 500, False),
+            (-1000, -500, False),
+        ]
+        for existing_units, units, expected in cases:
+            with self.subTest(existing_units=existing_units, units=units):
+                self.assertIs(executor._opposes(existing_units, units), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
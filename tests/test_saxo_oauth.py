@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.auth.saxo_oauth import SaxoOAuthClient, Token
+from src.config.setting import SaxoSettings
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self) -> None:
+        type(self).hits += 1
+        self.send_response(429)
+        self.send_header("Retry-After", "1")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ApiGetRateLimitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        _RateLimitedHandler.hits = 0
+        self.server = HTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        settings = SaxoSettings(
+            client_id="id",
+            client_secret="secret",
+            redirect_uri="http://localhost/callback",
+            environment="sim",
+            base_url=base,
+            auth_base=base,
+        )
+        self.oauth = SaxoOAuthClient(settings)
+        self.oauth.token = Token(access_token="access", refresh_token=None, expires_at=time.time() + 3600)
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_exhausted_429_arms_rate_limit_gate(self) -> None:
+        resp = self.oauth.api_get("/port/v1/balances/me")
+
+        # The session's Retry made the initial request plus three retries, then returned the 429.
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(_RateLimitedHandler.hits, 4)
+        self.assertGreater(self.oauth._rate_limited_until, time.monotonic())
+
+        with self.assertRaises(RuntimeError):
+            self.oauth.api_get("/port/v1/balances/me")
+        self.assertEqual(_RateLimitedHandler.hits, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
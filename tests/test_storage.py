@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.storage import connect_db, get_latest_batch_events, insert_parsed_event
+
+
+def _event(conn, segment_hash: str, scraped_at: str) -> None:
+    insert_parsed_event(
+        conn,
+        scraped_at=scraped_at,
+        segment_hash=segment_hash,
+        segment_text="",
+        is_trading=True,
+        pair="USDJPY",
+        action="CLOSE_TP",
+        side=None,
+        lot_ratio=None,
+        is_add=False,
+        entry_price=None,
+        sl_price=None,
+        tp_price=None,
+        signal_id=None,
+        direction=None,
+        instrument="USDJPY",
+        uic=22,
+        asset_type="FxSpot",
+        signal_timestamp=scraped_at,
+    )
+
+
+class LatestBatchEventsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.conn = connect_db(Path(self.tmp.name) / "fincs.db")
+        self.addCleanup(self.conn.close)
+
+    def test_batch_follows_the_newest_row_by_id(self) -> None:
+        _event(self.conn, "a", "2026-01-02T00:00:00+00:00")
+        _event(self.conn, "b", "2026-01-02T00:00:00+00:00")
+        # Backfilled afterwards with an older timestamp: it is still the newest batch.
+        _event(self.conn, "c", "2026-01-01T00:00:00+00:00")
+        _event(self.conn, "d", "2026-01-01T00:00:00+00:00")
+
+        rows = get_latest_batch_events(self.conn)
+
+        self.assertEqual([r["segment_hash"] for r in rows], ["d", "c"])
+
+    def test_batch_is_bounded_by_window(self) -> None:
+        for n in range(5):
+            _event(self.conn, f"s{n}", "2026-01-01T00:00:00+00:00")
+
+        rows = get_latest_batch_events(self.conn, window=3)
+
+        self.assertEqual([r["segment_hash"] for r in rows], ["s4", "s3", "s2"])
+
+
+if __name__ == "__main__":
+    unittest.main()